@@ -1,38 +1,34 @@
 from __future__ import annotations
 
-from typing import List
-import json
-import time
-import requests
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from .base import JobItem
-from .utils import RateLimiter, SimpleCache
+from .base import JobItem, ProviderAdapter
+from .utils import request_with_retry
 from api.settings import settings
 
 
-class AdzunaAdapter:
+class AdzunaAdapter(ProviderAdapter):
     source_name = "adzuna"
 
-    def __init__(self, cache: SimpleCache, limiter: RateLimiter) -> None:
-        self.cache = cache
-        self.limiter = limiter
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._country_upper = settings.adzuna_country_code.upper()
+        self._endpoint_tpl = f"https://api.adzuna.com/v1/api/jobs/{settings.adzuna_country_code}/search/{{page}}"
 
     def _endpoint(self, page: int) -> str:
-        country = settings.adzuna_country_code
-        return f"https://api.adzuna.com/v1/api/jobs/{country}/search/{page}"
+        return self._endpoint_tpl.format(page=page)
 
     def search(self, what: str, where: str, page: int, results_per_page: int) -> List[JobItem]:
-        cache_key = f"adzuna|{what.lower()}|{where.lower()}|{page}|{results_per_page}"
-        cached = self.cache.get(cache_key)
-        if cached is not None:
-            return cached
-
         if not settings.adzuna_app_id or not settings.adzuna_app_key:
             return []
-
-        if not self.limiter.allow():
-            return []
-
+        cache_key = (self.source_name, what, where, page, results_per_page)
+        return self._fetch(
+            cache_key, lambda acquire: self._send(acquire, what, where, page, results_per_page), self._parse,
+        )
+
+    def _send(
+        self, acquire: Callable[[], bool], what: str, where: str, page: int, results_per_page: int
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         params = {
             "app_id": settings.adzuna_app_id,
             "app_key": settings.adzuna_app_key,
@@ -42,42 +38,21 @@ class AdzunaAdapter:
             "max_days_old": "14",
             "sort_by": "date",
         }
-
-        url = self._endpoint(page)
-
-        backoff = 1.0
-        for attempt in range(4):
-            try:
-                resp = requests.get(url, params=params, timeout=20)
-                if resp.status_code == 429 or 500 <= resp.status_code < 600:
-                    if attempt == 3:
-                        return []
-                    retry_after = resp.headers.get("Retry-After")
-                    wait = float(retry_after) if retry_after and str(retry_after).isdigit() else backoff
-                    time.sleep(wait)
-                    backoff *= 2
-                    continue
-                resp.raise_for_status()
-                data = resp.json() or {}
-                self.limiter.record()
-                items = []
-                for it in data.get("results", []):
-                    title = it.get("title") or ""
-                    company = (it.get("company") or {}).get("display_name") or ""
-                    area = (it.get("location") or {}).get("area") or []
-                    city = area[-1] if area else ""
-                    location = ", ".join([p for p in [city, settings.adzuna_country_code.upper()] if p])
-                    description = it.get("description") or ""
-                    url = it.get("redirect_url") or ""
-                    created = it.get("created") or None
-                    items.append(JobItem(title, company, location, description, url, created, self.source_name))
-                self.cache.set(cache_key, items)
-                return items
-            except (requests.RequestException, json.JSONDecodeError):
-                if attempt == 3:
-                    return []
-                time.sleep(backoff)
-                backoff *= 2
-
-        return []
-
+        return request_with_retry(
+            self.session, "GET", self._endpoint(page), params=params, concurrency=self.concurrency,
+            acquire=acquire,
+        )
+
+    def _parse(self, data: Dict[str, Any]) -> List[JobItem]:
+        items = []
+        for it in data.get("results", []):
+            title = it.get("title") or ""
+            company = (it.get("company") or {}).get("display_name") or ""
+            area = (it.get("location") or {}).get("area") or []
+            city = area[-1] if area else ""
+            location = ", ".join([p for p in [city, self._country_upper] if p])
+            description = it.get("description") or ""
+            url = it.get("redirect_url") or ""
+            created = it.get("created") or None
+            items.append(JobItem(title, company, location, description, url, created, self.source_name))
+        return items
@@ -1,10 +1,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional, Protocol
+from typing import Any, Callable, Dict, Hashable, List, Optional, Protocol, Tuple
 
+from .utils import (
+    AdaptiveLimiter,
+    CircuitBreaker,
+    RateLimiter,
+    SimpleCache,
+    SingleFlight,
+    guarded_fetch,
+    make_session,
+)
+from api.rate_limiter import DailyBucket
 
-@dataclass
+
+@dataclass(slots=True)
 class JobItem:
     title: str
     company: str
@@ -18,6 +29,48 @@ class JobItem:
 class JobAdapter(Protocol):
     source_name: str
 
+    # `what`/`where` arrive already normalized (see api.index._normalize_terms); adapters
+    # use them verbatim in their cache keys.
     def search(self, what: str, where: str, page: int, results_per_page: int) -> List[JobItem]:
         ...
 
+
+
+class ProviderAdapter:
+    """Shared wiring for an HTTP provider: cache, quotas, concurrency and circuit breaker.
+
+    Subclasses set `source_name` and build their request and items; `_fetch` runs them
+    through guarded_fetch.
+    """
+
+    source_name: str
+
+    def __init__(
+        self,
+        cache: SimpleCache,
+        limiter: RateLimiter,
+        concurrency: Optional[AdaptiveLimiter] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        budget: Optional[DailyBucket] = None,
+    ) -> None:
+        self.cache = cache
+        self.limiter = limiter
+        self.concurrency = concurrency or AdaptiveLimiter()
+        self.breaker = breaker or CircuitBreaker(self.source_name)
+        self.budget = budget
+        self.session = make_session()
+        self._inflight = SingleFlight()
+
+    def _charge_budget(self) -> bool:
+        """Count one upstream attempt against the daily quota shared across processes."""
+        return self.budget is None or self.budget.try_acquire(self.source_name)
+
+    def _fetch(
+        self,
+        key: Hashable,
+        send: Callable[[Callable[[], bool]], Tuple[Optional[Dict[str, Any]], Optional[str]]],
+        parse: Callable[[Dict[str, Any]], List[JobItem]],
+    ) -> List[JobItem]:
+        return guarded_fetch(
+            self.cache, self._inflight, self.limiter, self.breaker, key, send, parse, charge=self._charge_budget,
+        )
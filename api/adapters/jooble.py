@@ -1,77 +1,53 @@
 from __future__ import annotations
 
-from typing import List
-import json
-import time
-import requests
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from .base import JobItem
-from .utils import RateLimiter, SimpleCache
+from .base import JobItem, ProviderAdapter
+from .utils import request_with_retry
 from api.settings import settings
 
 
-class JoobleAdapter:
+class JoobleAdapter(ProviderAdapter):
     source_name = "jooble"
 
-    def __init__(self, cache: SimpleCache, limiter: RateLimiter) -> None:
-        self.cache = cache
-        self.limiter = limiter
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._url = f"https://jooble.org/api/{settings.jooble_api_key}"
 
     def _endpoint(self) -> str:
-        return f"https://jooble.org/api/{settings.jooble_api_key}"
+        return self._url
 
     def search(self, what: str, where: str, page: int, results_per_page: int) -> List[JobItem]:
-        cache_key = f"jooble|{what.lower()}|{where.lower()}|{page}|{results_per_page}"
-        cached = self.cache.get(cache_key)
-        if cached is not None:
-            return cached
-
         if not settings.jooble_api_key:
             return []
-
-        if not self.limiter.allow():
-            return []
-
-        url = self._endpoint()
+        cache_key = (self.source_name, what, where, page, results_per_page)
+        return self._fetch(
+            cache_key, lambda acquire: self._send(acquire, what, where, page, results_per_page), self._parse,
+        )
+
+    def _send(
+        self, acquire: Callable[[], bool], what: str, where: str, page: int, results_per_page: int
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         payload = {
             "keywords": what,
             "location": where or settings.default_country,
             "page": page,
             "size": results_per_page,
         }
-
-        backoff = 1.0
-        for attempt in range(4):
-            try:
-                resp = requests.post(url, json=payload, timeout=20)
-                if resp.status_code == 429 or 500 <= resp.status_code < 600:
-                    if attempt == 3:
-                        return []
-                    retry_after = resp.headers.get("Retry-After")
-                    wait = float(retry_after) if retry_after and str(retry_after).isdigit() else backoff
-                    time.sleep(wait)
-                    backoff *= 2
-                    continue
-                resp.raise_for_status()
-                data = resp.json() or {}
-                self.limiter.record()
-                results = data.get("jobs") or data.get("results") or []
-                items: List[JobItem] = []
-                for it in results:
-                    title = it.get("title") or ""
-                    company = it.get("company") or ""
-                    location = it.get("location") or (it.get("city") or "")
-                    description = it.get("snippet") or it.get("description") or ""
-                    url = it.get("link") or it.get("url") or ""
-                    created = it.get("updated") or it.get("created") or None
-                    items.append(JobItem(title, company, location, description, url, created, self.source_name))
-                self.cache.set(cache_key, items)
-                return items
-            except (requests.RequestException, json.JSONDecodeError):
-                if attempt == 3:
-                    return []
-                time.sleep(backoff)
-                backoff *= 2
-
-        return []
-
+        return request_with_retry(
+            self.session, "POST", self._endpoint(), json=payload, concurrency=self.concurrency,
+            acquire=acquire,
+        )
+
+    def _parse(self, data: Dict[str, Any]) -> List[JobItem]:
+        results = data.get("jobs") or data.get("results") or []
+        items: List[JobItem] = []
+        for it in results:
+            title = it.get("title") or ""
+            company = it.get("company") or ""
+            location = it.get("location") or (it.get("city") or "")
+            description = it.get("snippet") or it.get("description") or ""
+            url = it.get("link") or it.get("url") or ""
+            created = it.get("updated") or it.get("created") or None
+            items.append(JobItem(title, company, location, description, url, created, self.source_name))
+        return items
@@ -1,46 +1,354 @@
 from __future__ import annotations
 
-from collections import deque
-from typing import Any, Deque, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple, TypeVar, Union
+import threading
 import time
 
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+T = TypeVar("T")
+
+RETRY_STATUSES = frozenset({429, *range(500, 600)})
+# (connect, read): fail fast on an unreachable host, but give slow result pages time to stream
+DEFAULT_TIMEOUT: Tuple[float, float] = (5.0, 20.0)
+# How long a failed provider request is remembered, so an outage is not retried on every request
+NEGATIVE_CACHE_TTL = 60.0
+
+# Why request_with_retry gave up. Only UNAVAILABLE means the provider itself is in trouble;
+# callers trip the circuit breaker and negative-cache on that alone.
+UNAVAILABLE = "unavailable"  # 429/5xx or network errors on every attempt
+REJECTED = "rejected"  # any other 4xx (bad request, credentials); not retried
+INVALID = "invalid"  # a success status with a body that is not JSON
+QUOTA = "quota"  # `acquire` refused the first attempt, so nothing was sent
+
+
+def make_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Advertise every encoding urllib3 can decode here (gzip/deflate, plus br/zstd when installed)
+    session.headers.update({"Accept-Encoding": ACCEPT_ENCODING, "Connection": "keep-alive"})
+    return session
+
 
 class RateLimiter:
+    """Per-minute/per-day quota. Each window is a ring holding the last N call times
+    (monotonic ns), so allow()/record() are O(1) and immune to wall-clock jumps."""
+
+    _MINUTE_NS = 60 * 1_000_000_000
+    _DAY_NS = 86400 * 1_000_000_000
+
     def __init__(self, max_per_minute: int = 60, max_per_day: int = 5000) -> None:
         self.max_per_minute = max_per_minute
         self.max_per_day = max_per_day
-        self._minute: Deque[float] = deque()
-        self._day: Deque[float] = deque()
+        self._minute: List[Optional[int]] = [None] * max(max_per_minute, 0)
+        self._day: List[Optional[int]] = [None] * max(max_per_day, 0)
+        self._minute_idx = 0
+        self._day_idx = 0
+        self._lock = threading.Lock()
 
     def allow(self) -> bool:
-        now = time.time()
-        while self._minute and now - self._minute[0] >= 60:
-            self._minute.popleft()
-        while self._day and now - self._day[0] >= 86400:
-            self._day.popleft()
-        return len(self._minute) < self.max_per_minute and len(self._day) < self.max_per_day
+        if not self._minute or not self._day:
+            return False
+        now = time.monotonic_ns()
+        with self._lock:
+            # The slot about to be overwritten holds the oldest call in each window
+            oldest_minute = self._minute[self._minute_idx]
+            oldest_day = self._day[self._day_idx]
+        return (oldest_minute is None or now - oldest_minute >= self._MINUTE_NS) and (
+            oldest_day is None or now - oldest_day >= self._DAY_NS
+        )
 
     def record(self) -> None:
-        ts = time.time()
-        self._minute.append(ts)
-        self._day.append(ts)
+        if not self._minute or not self._day:
+            return
+        ts = time.monotonic_ns()
+        with self._lock:
+            self._push(ts)
+
+    def acquire(self) -> bool:
+        """allow() and record() as one step, so concurrent callers cannot overshoot the quota."""
+        if not self._minute or not self._day:
+            return False
+        now = time.monotonic_ns()
+        with self._lock:
+            oldest_minute = self._minute[self._minute_idx]
+            oldest_day = self._day[self._day_idx]
+            if (oldest_minute is not None and now - oldest_minute < self._MINUTE_NS) or (
+                oldest_day is not None and now - oldest_day < self._DAY_NS
+            ):
+                return False
+            self._push(now)
+            return True
+
+    def _push(self, ts: int) -> None:
+        self._minute[self._minute_idx] = ts
+        self._minute_idx = (self._minute_idx + 1) % len(self._minute)
+        self._day[self._day_idx] = ts
+        self._day_idx = (self._day_idx + 1) % len(self._day)
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit per provider: +1 on a fast success, halve on 429/5xx/timeouts or slow responses."""
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        rtt_threshold: float = 5.0,
+        alpha: float = 0.2,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.current_limit = max(min_limit, min(initial, max_limit))
+        self.rtt_threshold = rtt_threshold
+        self.alpha = alpha
+        self.rtt_ewma: Optional[float] = None
+        self.overloads = 0
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        with self._cond:
+            while self._in_flight >= self.current_limit:
+                self._cond.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify()
+
+    def record(self, status: Optional[int], rtt: float) -> None:
+        """Feed back one attempt; `status` is None for timeouts/network errors."""
+        with self._cond:
+            overloaded = status is None or status == 429 or status >= 500
+            if not overloaded:
+                self.rtt_ewma = rtt if self.rtt_ewma is None else (1 - self.alpha) * self.rtt_ewma + self.alpha * rtt
+            if overloaded or (self.rtt_ewma is not None and self.rtt_ewma > self.rtt_threshold):
+                self.overloads += 1
+                self.current_limit = max(self.min_limit, int(self.current_limit * 0.5))
+            else:
+                self.current_limit = min(self.max_limit, self.current_limit + 1)
+            self._cond.notify_all()
+
+
+class CircuitBreaker:
+    """Stop calling a provider for `cooldown_seconds` after `threshold` consecutive failed requests.
+
+    Once the cooldown ends a single trial call goes through: success closes the breaker,
+    failure opens it for another cooldown. A trial that never reports back (the caller
+    bailed out before sending) lapses after a further cooldown.
+    """
+
+    def __init__(self, name: str, threshold: int = 3, cooldown_seconds: float = 300.0) -> None:
+        self.name = name
+        self.threshold = threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            since = self.opened_at if self._trial_at is None else self._trial_at
+            if now - since < self.cooldown_seconds:
+                return False
+            self._trial_at = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial_at is not None:
+                self.opened_at = time.monotonic()
+                self._trial_at = None
+            elif self.opened_at is None and self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+                print(f"{self.name}: {self.failures} failed requests in a row; pausing calls for {self.cooldown_seconds:g}s")
+
+
+def request_with_retry(
+    session: requests.Session,
+    method: str,
+    url: str,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    json: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+    attempts: int = 4,
+    concurrency: Optional[AdaptiveLimiter] = None,
+    acquire: Optional[Callable[[], bool]] = None,
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Send a request, backing off exponentially on 429/5xx and network errors.
+
+    Returns (decoded JSON object, None) on success, with {} for an empty body, or
+    (None, reason) when the request fails for good; reason is UNAVAILABLE, REJECTED,
+    INVALID or QUOTA. Other 4xx responses and undecodable bodies are not retried.
+
+    `acquire` is called before every attempt, retries included, to charge a quota; once
+    it returns False no further attempt is made.
+    """
+    backoff = 1.0
+    for attempt in range(1, attempts + 1):
+        if acquire is not None and not acquire():
+            # A refused retry still reports the failure that made it necessary
+            return None, QUOTA if attempt == 1 else UNAVAILABLE
+        try:
+            with concurrency.slot() if concurrency else nullcontext():
+                resp = session.request(method, url, params=params, json=json, headers=headers, timeout=timeout)
+        except requests.RequestException:
+            if concurrency:
+                concurrency.record(None, 0.0)
+            if attempt == attempts:
+                return None, UNAVAILABLE
+            time.sleep(backoff)
+            backoff *= 2
+            continue
+
+        if concurrency:
+            concurrency.record(resp.status_code, resp.elapsed.total_seconds())
+        if resp.status_code in RETRY_STATUSES:
+            if attempt == attempts:
+                return None, UNAVAILABLE
+            retry_after = resp.headers.get("Retry-After", "")
+            time.sleep(int(retry_after) if retry_after.isdigit() else backoff)
+            backoff *= 2
+            continue
+        if resp.status_code >= 400:
+            return None, REJECTED
+        try:
+            return (orjson.loads(resp.content) if resp.content else None) or {}, None
+        except orjson.JSONDecodeError:
+            return None, INVALID
+    return None, UNAVAILABLE
 
 
 class SimpleCache:
-    def __init__(self, ttl_seconds: int = 3600) -> None:
+    """TTL cache with LRU eviction once more than `max_items` entries are stored."""
+
+    def __init__(self, ttl_seconds: int = 3600, max_items: int = 4096) -> None:
         self.ttl = ttl_seconds
-        self._data: Dict[str, Tuple[float, Any]] = {}
+        self.max_items = max_items
+        # key -> (expires_at, value)
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if not entry:
+                return None
+            expires_at, value = entry
+            if time.time() > expires_at:
+                self._data.pop(key, None)
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store `value`; `ttl` overrides the cache-wide lifetime for this entry."""
+        with self._lock:
+            self._data[key] = (time.time() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key: the first caller runs `fn`, callers that
+    arrive while it is in flight wait for it and get the same result (or exception)."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, "Future[Any]"] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+        if not leader:
+            return call.result()
+        try:
+            result = fn()
+        except BaseException as exc:
+            call.set_exception(exc)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+def guarded_fetch(
+    cache: SimpleCache,
+    flight: SingleFlight,
+    limiter: RateLimiter,
+    breaker: CircuitBreaker,
+    key: Hashable,
+    send: Callable[[Callable[[], bool]], Tuple[Optional[Dict[str, Any]], Optional[str]]],
+    parse: Callable[[Dict[str, Any]], List[T]],
+    charge: Optional[Callable[[], bool]] = None,
+) -> List[T]:
+    """Serve `key` from `cache`, or fetch it once through the provider's guards.
+
+    `send(acquire)` performs the upstream call, passing `acquire` on to request_with_retry,
+    and returns its (data, reason). Every attempt takes a `limiter` slot and then calls
+    `charge` (e.g. a daily budget), if given. `parse` maps a decoded body to items, which
+    are cached under `key`. Returns [] when the provider is out of quota, paused by
+    `breaker`, or the request fails.
+    """
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
 
-    def get(self, key: str) -> Optional[Any]:
-        entry = self._data.get(key)
-        if not entry:
-            return None
-        ts, value = entry
-        if time.time() - ts > self.ttl:
-            self._data.pop(key, None)
-            return None
-        return value
+    def acquire() -> bool:
+        return limiter.acquire() and (charge is None or charge())
 
-    def set(self, key: str, value: Any) -> None:
-        self._data[key] = (time.time(), value)
+    def fetch() -> List[T]:
+        # Skip a provider that keeps failing without spending a quota slot or a timeout on it
+        if not breaker.allow():
+            return []
+        data, failure = send(acquire)
+        if failure == UNAVAILABLE:
+            breaker.record_failure()
+            cache.set(key, [], ttl=NEGATIVE_CACHE_TTL)
+            return []
+        if failure == QUOTA:
+            # Quota spent before anything was sent
+            return []
+        # The provider answered, so a rejected request or bad body is not an outage
+        breaker.record_success()
+        if data is None:
+            return []
+        items = parse(data)
+        cache.set(key, items)
+        return items
 
+    # Identical requests that miss together share one upstream call (and one quota slot)
+    return flight.do(key, fetch)
@@ -1,18 +1,27 @@
-from fastapi import FastAPI, Query
+from fastapi import BackgroundTasks, FastAPI, Query, Response
+from fastapi.responses import JSONResponse
+from contextlib import contextmanager
+from dataclasses import asdict
 from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
-from typing import List, Dict, Any, Tuple, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Set, Tuple, Optional
 import re
-from collections import deque
+import sys
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, wait
 import hashlib
-import json
+import math
+import heapq
+import html
 import os
 import smtplib
 import threading
 import time
 
+import orjson
 import requests
 import schedule
+from email.message import Message
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
@@ -20,12 +29,22 @@ from email.mime.multipart import MIMEMultipart
 # Load environment variables from .env file
 load_dotenv()
 
-app = FastAPI()
+
+class _OrjsonResponse(JSONResponse):
+    """Encode responses with orjson (already used for provider payloads) instead of stdlib json."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+app = FastAPI(default_response_class=_OrjsonResponse)
 
 # New imports and shared instances for unified /jobs endpoint
 from api.settings import settings
-from api.adapters.utils import SimpleCache, RateLimiter
+from api.adapters.utils import DEFAULT_TIMEOUT, AdaptiveLimiter, SimpleCache, RateLimiter, make_session
 from api.adapters.base import JobItem
+from api.rate_limiter import DailyBucket
+from api.seen_store import RejectedRow, SeenJobStore, SeenRow
 from api.adapters.jsearch import JSearchAdapter
 from api.adapters.jooble import JoobleAdapter
 from api.adapters.adzuna import AdzunaAdapter
@@ -36,10 +55,36 @@ _jsearch_limits = _limits.get("jsearch", {"per_min": 25, "per_day": 80})
 _jooble_limits = _limits.get("jooble", {"per_min": 30, "per_day": 500})
 _adzuna_limits = _limits.get("adzuna", {"per_min": 25, "per_day": 250})
 
-_shared_cache = SimpleCache(ttl_seconds=settings.cache_ttl_seconds)
-_jsearch = JSearchAdapter(_shared_cache, RateLimiter(_jsearch_limits["per_min"], _jsearch_limits["per_day"]))
-_jooble = JoobleAdapter(_shared_cache, RateLimiter(_jooble_limits["per_min"], _jooble_limits["per_day"]))
-_adzuna = AdzunaAdapter(_shared_cache, RateLimiter(_adzuna_limits["per_min"], _adzuna_limits["per_day"]))
+# Most requests in flight per source at once; the adaptive limiter works below this cap
+_jsearch_concurrency = AdaptiveLimiter(max_limit=_jsearch_limits.get("concurrent", 2))
+_jooble_concurrency = AdaptiveLimiter(max_limit=_jooble_limits.get("concurrent", 3))
+_adzuna_concurrency = AdaptiveLimiter(max_limit=_adzuna_limits.get("concurrent", 3))
+
+# per_day also holds across restarts, cron runs and workers: every upstream attempt, retries
+# included, is counted in this file. Adzuna's count is shared with the scheduled scan, which
+# uses the same account. The file is opened on first use; if it cannot be, budgets are off.
+USAGE_DB_FILE = os.getenv("USAGE_DB_FILE", "provider_usage.db")
+_daily_budget = DailyBucket(USAGE_DB_FILE, {
+    "jsearch": _jsearch_limits["per_day"],
+    "jooble": _jooble_limits["per_day"],
+    "adzuna": _adzuna_limits["per_day"],
+})
+
+_shared_cache = SimpleCache(ttl_seconds=settings.cache_ttl_seconds, max_items=settings.cache_max_items)
+_jsearch = JSearchAdapter(
+    _shared_cache, RateLimiter(_jsearch_limits["per_min"], _jsearch_limits["per_day"]), _jsearch_concurrency,
+    budget=_daily_budget,
+)
+_jooble = JoobleAdapter(
+    _shared_cache, RateLimiter(_jooble_limits["per_min"], _jooble_limits["per_day"]), _jooble_concurrency,
+    budget=_daily_budget,
+)
+_adzuna = AdzunaAdapter(
+    _shared_cache, RateLimiter(_adzuna_limits["per_min"], _adzuna_limits["per_day"]), _adzuna_concurrency,
+    budget=_daily_budget,
+)
+# Runs /jobs provider calls; sized above one request's fan-out so concurrent requests do not queue
+_provider_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="provider")
 
 
 # ---- Scheduler flag (true by default for local) ----
@@ -60,13 +105,45 @@ DEFAULT_WHERE = os.getenv("ADZUNA_WHERE", "Canada")
 RATE_MAX_PER_MINUTE = int(os.getenv("ADZUNA_RATE_PER_MIN", "25"))
 RATE_MAX_PER_DAY = int(os.getenv("ADZUNA_RATE_PER_DAY", "250"))
 
+# Concurrent (query, page) fetches during a scan
+SCAN_MAX_WORKERS = int(os.getenv("SCAN_MAX_WORKERS", "8"))
+SCAN_PAGES = max(1, int(os.getenv("PAGES", "2")))  # pages per query
+# Adzuna serves up to 50 results per page, so fold PAGES x ADZUNA_RESULTS_PER_PAGE into as few
+# requests as possible (2 x 20 -> one request for 40)
+ADZUNA_MAX_RESULTS_PER_PAGE = 50
+SCAN_RESULTS_WANTED = SCAN_PAGES * DEFAULT_RESULTS_PER_PAGE
+SCAN_RESULTS_PER_REQUEST = max(1, min(ADZUNA_MAX_RESULTS_PER_PAGE, SCAN_RESULTS_WANTED))
+SCAN_REQUESTS_PER_QUERY = -(-SCAN_RESULTS_WANTED // SCAN_RESULTS_PER_REQUEST)
+SCAN_DEADLINE_SECONDS = float(os.getenv("SCAN_DEADLINE_SECONDS", "60"))  # overall fetch budget
+
 # Simple in-memory cache TTL (seconds)
 CACHE_TTL_SECONDS = int(os.getenv("ADZUNA_CACHE_TTL", str(60 * 60)))  # 1 hour
 ADZUNA_MAX_DAYS_OLD = int(os.getenv("ADZUNA_MAX_DAYS_OLD", "7"))  # API-side freshness filter
+# Scans ask only for postings since the last completed scan, reaching back this much further
+# to catch postings the provider indexes late
+SCAN_OVERLAP_HOURS = float(os.getenv("SCAN_OVERLAP_HOURS", "24"))
 JOB_MAX_AGE_DAYS = int(os.getenv("JOB_MAX_AGE_DAYS", "10"))       # Local freshness guard
+ELIGIBILITY_DESC_CHARS = int(os.getenv("ELIGIBILITY_DESC_CHARS", "2048"))  # 0 = scan the whole description
 
 # Persistence
-JOBS_FILE = "jobs_seen.json"
+SEEN_DB_FILE = os.getenv("SEEN_DB_FILE", "jobs_seen.db")
+JOBS_FILE = "jobs_seen.json"  # legacy JSON store, imported into SEEN_DB_FILE once
+JOB_HASH_ALGO = "blake2b-64"  # bump when create_job_hash changes so stored keys are re-derived
+UNKNOWN_LOCATION = "Remote/Unknown"  # stored/emailed in place of an empty location
+SEEN_CLEANUP_INTERVAL = 3600  # prune entries older than 30 days at most hourly
+
+# The seen-jobs store is opened once per process; the lock also serializes scan batches
+_seen_lock = threading.RLock()
+_seen_store: Optional[SeenJobStore] = None
+_last_seen_cleanup = 0.0
+
+# One scan at a time per process (scheduler, CLI and endpoints); state is reported by /api/health
+SCAN_LOCK = threading.Lock()
+SCAN_STATE: Dict[str, Any] = {"running": False, "started_at": None, "last_finished_at": None}
+
+# In-process scheduler thread and the event that stops it on shutdown
+_scheduler_stop = threading.Event()
+_scheduler_thread: Optional[threading.Thread] = None
 
 # Email configuration
 SMTP_SERVER = os.getenv("SMTP_HOST", "smtp.gmail.com")
@@ -83,11 +160,15 @@ RECIPIENT_EMAILS = [email.strip() for email in RECIPIENT_EMAILS_STRING.split(","
 
 print(f"Email will be sent to: {RECIPIENT_EMAILS}")  # Debug line to verify emails
 
+# Authenticated SMTP session kept between digests; checked with NOOP before reuse
+_smtp_lock = threading.RLock()
+_smtp_conn: Optional[smtplib.SMTP] = None
+
 
 # ------------------------ Keywords & Filters ------------------------
 
 # Keywords for filtering jobs
-ROLE_KEYWORDS = [
+ROLE_KEYWORDS = (
     # AI/ML Keywords
     "ai engineer", "artificial intelligence engineer", "machine learning engineer", "ml engineer",
     "deep learning engineer", "neural network engineer", "computer vision engineer",
@@ -113,43 +194,40 @@ ROLE_KEYWORDS = [
     "computer vision", "image processing", "speech recognition", "recommendation systems",
     "reinforcement learning", "ai consultant", "machine learning consultant",
     "data mining", "predictive analytics", "statistical analysis",
-]
+)
 
 # More strict experience filtering for 0-1.5 years
-EXPERIENCE_KEYWORDS = [
+EXPERIENCE_KEYWORDS = (
     "entry level", "junior", "associate", "fresh graduate", "new grad", "graduate",
     "0-1 years", "0-2 years", "1-2 years", "0-1.5 years", "1-1.5 years",
     "no experience required", "recent graduate", "graduate program", "trainee",
     "beginner", "starting career", "new to field",
     "career starter", "entry-level", "junior level", "0 years", "1 year",
     "up to 1.5", "less than 2", "under 2 years", "18 months", "one year",
-]
+)
 
 # Updated senior keywords to exclude (stricter for 1.5+ years)
-SENIOR_KEYWORDS = [
+SENIOR_KEYWORDS = (
     # English seniority
     "senior", "sr.", "sr ", "lead", "principal", "staff", "architect", "manager", "director",
     "head of", "chief", "consultant", "specialist", "intermediate", "mid level", "mid-level",
     # French seniority
     "intermédiaire", "expérimenté", "confirmé", "chef d’équipe", "chef d'equipe", "responsable",
-    # Ranges and years
-    "2+ years", "3+ years", "4+ years", "5+ years", "6+ years", "7+ years", "8+ years",
-    "minimum 2 years", "minimum 3 years", "minimum 4 years", "minimum 5 years",
-    "2-3 years", "3-5 years", "5-7 years", "experienced professional", "expert level",
-    "principal engineer",
-]
+    # Year counts ("2+ years", "3-5 years", ...) are matched by _YEARS_RE
+    "experienced professional", "expert level", "principal engineer",
+)
 
 # Keywords indicating ineligibility due to visa/citizenship requirements
-INELIGIBLE_KEYWORDS = [
+INELIGIBLE_KEYWORDS = (
     "permanent resident", "pr required", "citizenship required",
     "security clearance", "must be citizen", "canadian citizen only",
     "us citizen only", "citizen required", "must be canadian citizen",
     "canadian pr required", "permanent residency required", "clearance required",
     "government clearance", "background clearance", "must have pr", "pr status required",
-]
+)
 
 # Explicitly exclude co-op and roles requiring active university enrollment
-EXCLUDE_ENROLLMENT_KEYWORDS = [
+EXCLUDE_ENROLLMENT_KEYWORDS = (
     "co-op", "co op", "cooperative education", "co-operative",
     "work-study", "work study", "coop program", "co-op term",
     "currently enrolled", "must be enrolled", "enrolled in", "active student",
@@ -158,91 +236,249 @@ EXCLUDE_ENROLLMENT_KEYWORDS = [
     # Intern keywords (generic)
     "internship",  # generic internship mention
     # French student/intern terms
-    "stagiaire", "stage", "étudiant", "etudiant", "étudiante", "etudiante",
+    "stagiaire", "stagiaires", "stage", "étudiant", "etudiant", "étudiante", "etudiante",
+    "étudiants", "etudiants", "étudiantes", "etudiantes",
     "inscrit", "inscrite", "inscription", "université", "universite", "collège", "college",
-]
+)
+
+# Broader AI/ML/data terms accepted when no ROLE_KEYWORDS match
+AI_ML_TERMS = (
+    "artificial intelligence", "machine learning", "data science", "data analyst",
+    "deep learning", "neural network", "computer vision", "natural language",
+    "nlp", "data mining", "predictive analytics", "statistical analysis",
+    "big data", "data engineer", "business intelligence", "analytics",
+    "llm", "generative ai", "chatbot", "recommendation system", "ai agent",
+    "prompt engineering", "mlops", "data pipeline", "etl", "sql",
+)
+
+# Explicit experience ranges within the 0-1.5 year target
+ACCEPTABLE_EXPERIENCE = (
+    "0-1 years", "0-1.5 years", "1-1.5 years", "0 to 1", "0 to 1.5",
+    "up to 1", "up to 1.5", "less than 2", "under 2 years", "1 year",
+    "one year", "18 months", "0-18 months", "1.5 years max", "maximum 1.5",
+)
+
+# Experience mentions that usually mean more than 1.5 years...
+PROBLEMATIC_EXPERIENCE = (
+    "2 years", "3 years", "4 years", "5 years", "years of experience",
+    "years experience", "minimum years", "must have experience",
+    "required experience", "proven experience", "extensive experience",
+    "solid experience", "strong experience", "professional experience",
+)
+
+# ...unless the posting softens them
+FLEXIBLE_TERMS = (
+    "preferred but not required", "nice to have", "bonus", "plus",
+    "would be great", "ideal but not required", "strongly preferred but not required",
+    "some experience helpful", "any experience welcome", "little experience ok",
+    "entry level welcome", "new graduates welcome", "fresh graduates welcome",
+)
+
+# Training/graduate program indicators
+ENTRY_INDICATORS = (
+    "training provided", "will train", "learn on job", "mentorship",
+    "graduate program", "rotational program", "development program",
+    "internship program", "apprenticeship", "on the job training",
+)
+
+
+def _keyword_pattern(keywords: Tuple[str, ...], whole_words: bool = False) -> "re.Pattern[str]":
+    """Compile a keyword list into one alternation so a job is scanned once per list, in C.
+
+    With whole_words, a keyword edge that is a word character must not touch another word
+    character, so "lead" no longer matches "leadership" and "stage" no longer matches "backstage".
+    """
+    parts = []
+    # Longest first so overlapping phrases report the most specific keyword.
+    for kw in sorted((k.casefold() for k in keywords), key=len, reverse=True):
+        part = re.escape(kw)
+        if whole_words:
+            if re.match(r"\w", kw):
+                part = r"(?<!\w)" + part
+            if re.match(r"\w", kw[-1]):
+                part += r"(?!\w)"
+        parts.append(part)
+    return re.compile("|".join(parts))
+
+
+# Exclusion lists are matched on word boundaries: substring hits such as "architecture" or
+# "staffing" were rejecting otherwise eligible junior postings.
+_INELIGIBLE_RE = _keyword_pattern(INELIGIBLE_KEYWORDS, whole_words=True)
+_ENROLLMENT_RE = _keyword_pattern(EXCLUDE_ENROLLMENT_KEYWORDS, whole_words=True)
+_SENIOR_RE = _keyword_pattern(SENIOR_KEYWORDS, whole_words=True)
+_ROLE_RE = _keyword_pattern(ROLE_KEYWORDS)
+_EXPERIENCE_RE = _keyword_pattern(EXPERIENCE_KEYWORDS)
+_AI_ML_TERMS_RE = _keyword_pattern(AI_ML_TERMS)
+_ACCEPTABLE_EXPERIENCE_RE = _keyword_pattern(ACCEPTABLE_EXPERIENCE)
+_PROBLEMATIC_EXPERIENCE_RE = _keyword_pattern(PROBLEMATIC_EXPERIENCE)
+_FLEXIBLE_TERMS_RE = _keyword_pattern(FLEXIBLE_TERMS)
+_ENTRY_INDICATORS_RE = _keyword_pattern(ENTRY_INDICATORS)
+
+# A stated experience requirement: "2 years", "3+ yrs", "minimum 3 years", "3-5 years".
+# Group 1 is the lower bound; the lookbehind keeps "1.5 years" from matching as "5 years".
+# Company history ("for over 50 years", "founded 30 years ago") is skipped by the word before it.
+_YEARS_RE = re.compile(
+    r"(?<![\d.])(?<!\bover\s)(?<!\bfor\s)(?<!\bsince\s)(?<!\bfounded\s)"
+    r"(\d+(?:\.\d+)?)\s*(?:\+|(?:-|–|to)\s*\d+(?:\.\d+)?)?\s*(?:years?|yrs)\b"
+)
+# French requirement, e.g. "2 ans d'expérience". The gap is short and stays inside one
+# sentence, so "2 ans de contrat. Aucune expérience requise." does not pair up.
+_FR_YEARS_RE = re.compile(r"\b(?:[2-9]|[1-9]\d+)\s*ans\b[^.;!?\n]{0,30}?(?:d['’]\s*)?(?:expérien|experien)")
+# Word boundaries so "internal" and "international" do not count
+_INTERN_RE = re.compile(r"\b(?:intern|internship|summer intern|fall intern|winter intern|spring intern)\b")
+# II/III/IV levels in a title
+_LEVEL_RE = re.compile(r"\b(?:ii|iii|iv)\b", re.IGNORECASE)
+
+# Bump when is_eligible_job's rules change in code; keyword lists and the description
+# limit are folded into the fingerprint automatically
+ELIGIBILITY_RULES_VERSION = 8
+_ELIGIBILITY_SALT = hashlib.blake2b(
+    repr((
+        ELIGIBILITY_RULES_VERSION, ELIGIBILITY_DESC_CHARS, ROLE_KEYWORDS, EXPERIENCE_KEYWORDS,
+        SENIOR_KEYWORDS, INELIGIBLE_KEYWORDS, EXCLUDE_ENROLLMENT_KEYWORDS, AI_ML_TERMS,
+        ACCEPTABLE_EXPERIENCE, PROBLEMATIC_EXPERIENCE, FLEXIBLE_TERMS, ENTRY_INDICATORS,
+    )).encode(),
+    digest_size=8,
+).digest()
 
 
 # ------------------------ Persistence helpers ------------------------
 
 def load_seen_jobs() -> Dict[str, Any]:
+    """Read the legacy JSON store (only used to migrate it into SQLite)."""
     if not os.path.exists(JOBS_FILE):
-        return {"last_updated": "", "seen_jobs": {}}
+        return {"last_updated": "", "hash_algo": JOB_HASH_ALGO, "seen_jobs": {}}
     try:
-        with open(JOBS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(JOBS_FILE, "rb") as f:
+            data = orjson.loads(f.read())
     except Exception:
-        return {"last_updated": "", "seen_jobs": {}}
-
-
-def save_seen_jobs(data: Dict[str, Any]) -> None:
-    try:
-        with open(JOBS_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-    except Exception as e:
-        print(f"Error saving jobs file: {e}")
+        return {"last_updated": "", "hash_algo": JOB_HASH_ALGO, "seen_jobs": {}}
+    if data.get("hash_algo") != JOB_HASH_ALGO:
+        data = _rehash_seen_jobs(data)
+    return data
 
 
 def create_job_hash(title: str, company: str, location: str) -> str:
-    combined = f"{title.lower()}-{company.lower()}-{location.lower()}"
-    return hashlib.md5(combined.encode()).hexdigest()
-
-
-def cleanup_old_jobs(seen_jobs: Dict[str, Any], days_threshold: int = 30) -> Dict[str, Any]:
-    cutoff_date = datetime.now() - timedelta(days=days_threshold)
-    cutoff_str = cutoff_date.strftime("%Y-%m-%d")
-    jobs_to_remove = [
-        job_hash
-        for job_hash, job_data in seen_jobs.get("seen_jobs", {}).items()
-        if job_data.get("first_seen", "0000-00-00") < cutoff_str
-    ]
-    for job_hash in jobs_to_remove:
-        del seen_jobs["seen_jobs"][job_hash]
-    return seen_jobs
+    # Dedup key only (no integrity requirement), so a short BLAKE2b digest replaces MD5.
+    # Parts are fed incrementally with a unit separator instead of building a joined string.
+    h = hashlib.blake2b(digest_size=8)
+    h.update(title.lower().encode())
+    h.update(b"\x1f")
+    h.update(company.lower().encode())
+    h.update(b"\x1f")
+    h.update(location.lower().encode())
+    return h.hexdigest()
+
+
+def content_fingerprint(job: Dict[str, Any]) -> str:
+    """Hash what the eligibility filter reads (plus the rule set), so an unchanged rejected
+    posting can be recognised on later scans without filtering it again."""
+    h = hashlib.blake2b(_ELIGIBILITY_SALT, digest_size=8)
+    h.update((job.get("job_title") or job.get("title") or "").encode())
+    h.update(b"\x1f")
+    h.update((job.get("job_description") or job.get("description") or "").encode())
+    return h.hexdigest()
+
+
+def _stored_location(location: str) -> str:
+    """Map the stored placeholder back to the empty location the hash was built from."""
+    return "" if location == UNKNOWN_LOCATION else location
+
+
+def _rehash_seen_jobs(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Re-key entries written by an older hash function from their stored title/company/location."""
+    rekeyed: Dict[str, Any] = {}
+    for job_data in data.get("seen_jobs", {}).values():
+        location = _stored_location(job_data.get("location") or "")
+        key = create_job_hash(job_data.get("title") or "", job_data.get("company") or "", location)
+        rekeyed[key] = job_data
+    data["seen_jobs"] = rekeyed
+    data["hash_algo"] = JOB_HASH_ALGO
+    return data
+
+
+def _open_seen_store() -> SeenJobStore:
+    """Open the SQLite store, importing the legacy JSON file or re-keying rows as needed."""
+    store = SeenJobStore(SEEN_DB_FILE)
+    stored_algo = store.get_meta("hash_algo")
+    if stored_algo is None:
+        legacy = load_seen_jobs().get("seen_jobs", {})
+        if legacy:
+            store.replace_all(
+                (
+                    key,
+                    d.get("title") or "",
+                    d.get("company") or "",
+                    d.get("location") or "",
+                    d.get("first_seen") or "",
+                    d.get("last_seen") or d.get("first_seen") or "",
+                    d.get("url") or "",
+                )
+                for key, d in legacy.items()
+            )
+            print(f"Imported {len(legacy)} seen jobs from {JOBS_FILE} into {SEEN_DB_FILE}")
+    elif stored_algo != JOB_HASH_ALGO:
+        store.replace_all(
+            (create_job_hash(title, company, _stored_location(location)), title, company, location, first, last, url)
+            for _, title, company, location, first, last, url in store.rows()
+        )
+    if stored_algo != JOB_HASH_ALGO:
+        store.set_meta("hash_algo", JOB_HASH_ALGO)
+    return store
+
+
+def get_seen_store() -> SeenJobStore:
+    """Return the process-wide seen-jobs store, opening it on first use."""
+    global _seen_store
+    with _seen_lock:
+        if _seen_store is None:
+            _seen_store = _open_seen_store()
+        return _seen_store
+
+
+def close_seen_store() -> None:
+    global _seen_store
+    with _seen_lock:
+        if _seen_store is not None:
+            _seen_store.close()
+            _seen_store = None
+
+
+def cleanup_old_jobs(store: SeenJobStore, days_threshold: int = 30, now: Optional[datetime] = None) -> int:
+    cutoff_str = ((now or datetime.now()) - timedelta(days=days_threshold)).strftime("%Y-%m-%d")
+    return store.prune(cutoff_str)
+
+
+def _cleanup_seen_jobs_if_due(now: datetime) -> SeenJobStore:
+    """Return the seen-jobs store, pruning old entries at most once per SEEN_CLEANUP_INTERVAL."""
+    global _last_seen_cleanup
+    with _seen_lock:
+        store = get_seen_store()
+        mono_now = time.monotonic()
+        if not _last_seen_cleanup or mono_now - _last_seen_cleanup >= SEEN_CLEANUP_INTERVAL:
+            cleanup_old_jobs(store, now=now)
+            _last_seen_cleanup = mono_now
+        return store
 
 
 # ------------------------ Rate limiting & cache ------------------------
 
-_minute_window: deque[float] = deque()
-_day_window: deque[float] = deque()
-_cache: Dict[str, Dict[str, Any]] = {}
+# Local Adzuna quota for scans; reserving a slot is atomic, so scan worker threads can share it
+_scan_limiter = RateLimiter(RATE_MAX_PER_MINUTE, RATE_MAX_PER_DAY)
+# Per-page scan results; thread-safe and bounded, so concurrent scan workers can share it
+_cache = SimpleCache(ttl_seconds=CACHE_TTL_SECONDS, max_items=settings.cache_max_items)
 
 
-def _rate_allow() -> bool:
-    now = time.time()
-    while _minute_window and now - _minute_window[0] >= 60:
-        _minute_window.popleft()
-    while _day_window and now - _day_window[0] >= 24 * 3600:
-        _day_window.popleft()
-    return len(_minute_window) < RATE_MAX_PER_MINUTE and len(_day_window) < RATE_MAX_PER_DAY
+def _cache_key(what: str, where: str, page_num: int, results_per_page: int,
+               max_days_old: int) -> Tuple[str, str, int, int, int]:
+    return (what.casefold(), where.casefold(), page_num, results_per_page, max_days_old)
 
 
-def _rate_record() -> None:
-    ts = time.time()
-    _minute_window.append(ts)
-    _day_window.append(ts)
+def is_fresh_job(posted_at: str, max_age_days: int, now_utc: Optional[datetime] = None) -> bool:
+    """Return True if posted_at (ISO string) is within max_age_days from now. Empty value is treated as fresh=False.
 
-
-def _cache_key(what: str, where: str, page_num: int, results_per_page: int) -> str:
-    return f"{what.lower()}|{where.lower()}|{page_num}|{results_per_page}"
-
-
-def _cache_get(key: str) -> Optional[List[Dict[str, Any]]]:
-    item = _cache.get(key)
-    if not item:
-        return None
-    if time.time() - item["ts"] > CACHE_TTL_SECONDS:
-        _cache.pop(key, None)
-        return None
-    return item["data"]
-
-
-def _cache_set(key: str, data: List[Dict[str, Any]]) -> None:
-    _cache[key] = {"ts": time.time(), "data": data}
-
-
-def is_fresh_job(posted_at: str, max_age_days: int) -> bool:
-    """Return True if posted_at (ISO string) is within max_age_days from now. Empty value is treated as fresh=False."""
+    Batch callers pass `now_utc` so the clock is read once per scan rather than per job.
+    """
     if not posted_at:
         return False
     try:
@@ -251,30 +487,40 @@ def is_fresh_job(posted_at: str, max_age_days: int) -> bool:
         dt = datetime.fromisoformat(ts)
     except Exception:
         return False
-    age = datetime.now(timezone.utc) - (dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc))
+    age = (now_utc or datetime.now(timezone.utc)) - (dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc))
     return age.days <= max_age_days
 
 
 # ------------------------ Search helpers (Adzuna) ------------------------
 
-def _adzuna_request(what: str, where: str, page_num: int, results_per_page: int) -> List[Dict[str, Any]]:
+# One pooled keep-alive session for every scan request (TLS handshake paid once per connection)
+_adzuna_session = make_session()
+
+# Query parameters that are the same on every call
+_ADZUNA_BASE_PARAMS: Dict[str, str] = {
+    "app_id": ADZUNA_APP_ID,
+    "app_key": ADZUNA_APP_KEY,
+    "sort_by": "date",
+    "content-type": "application/json",
+}
+
+def _adzuna_request(what: str, where: str, page_num: int, results_per_page: int,
+                    max_days_old: int = ADZUNA_MAX_DAYS_OLD) -> Optional[List[Dict[str, Any]]]:
+    """Fetch one Adzuna results page; None when the request was skipped or failed."""
     if not ADZUNA_APP_ID or not ADZUNA_APP_KEY:
         print("Adzuna credentials missing. Set APP_ID and APP_KEY in environment.")
-        return []
+        return None
 
-    if not _rate_allow():
+    if not _scan_limiter.acquire():
         print("Adzuna rate limit reached (local guard). Skipping request.")
-        return []
+        return None
 
     params = {
-        "app_id": ADZUNA_APP_ID,
-        "app_key": ADZUNA_APP_KEY,
+        **_ADZUNA_BASE_PARAMS,
         "what": what,
         "where": where,
         "results_per_page": str(results_per_page),
-        "max_days_old": str(ADZUNA_MAX_DAYS_OLD),
-        "sort_by": "date",
-        "content-type": "application/json",
+        "max_days_old": str(max_days_old),
     }
 
     url = ADZUNA_BASE_URL.format(page=page_num)
@@ -282,13 +528,17 @@ def _adzuna_request(what: str, where: str, page_num: int, results_per_page: int)
     backoff = 1.0
     max_attempts = 4
     for attempt in range(1, max_attempts + 1):
+        # Each attempt, retries included, is charged to the daily budget
+        if not _daily_budget.try_acquire("adzuna"):
+            print("Adzuna daily budget spent (shared with /jobs). Skipping request.")
+            return None
         try:
-            resp = requests.get(url, params=params, timeout=20)
+            resp = _adzuna_session.get(url, params=params, timeout=DEFAULT_TIMEOUT)
             status = resp.status_code
             if status == 429 or 500 <= status < 600:
                 if attempt == max_attempts:
                     print(f"Adzuna request failed after retries: HTTP {status}")
-                    return []
+                    return None
                 retry_after = resp.headers.get("Retry-After")
                 sleep_for = float(retry_after) if retry_after and str(retry_after).isdigit() else backoff
                 print(f"Adzuna HTTP {status}. Backing off {sleep_for:.1f}s (attempt {attempt}).")
@@ -297,39 +547,44 @@ def _adzuna_request(what: str, where: str, page_num: int, results_per_page: int)
                 continue
 
             resp.raise_for_status()
-            data = resp.json() or {}
-            results = data.get("results", [])
-            _rate_record()
-            return results
+            if not resp.content:  # nothing to parse
+                return []
+            data = orjson.loads(resp.content) or {}
+            return data.get("results", [])
         except requests.RequestException as e:
             if attempt == max_attempts:
                 print(f"Adzuna network error after retries: {e}")
-                return []
+                return None
             print(f"Adzuna network error: {e}. Backoff {backoff:.1f}s (attempt {attempt}).")
             time.sleep(backoff)
             backoff *= 2
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             print("Adzuna JSON decode error.")
-            return []
+            return None
 
-    return []
+    return None
 
 
 def search_jobs_by_query(query: str, page_num: int = 1, where: Optional[str] = None,
-                         results_per_page: Optional[int] = None) -> List[Dict[str, Any]]:
+                         results_per_page: Optional[int] = None,
+                         max_days_old: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
     """Search for jobs using Adzuna API with specific query and page number.
 
-    Returns a list of dicts mapped to both legacy and normalized fields.
+    Returns a list of dicts mapped to both legacy and normalized fields, or None when the
+    request was skipped or failed. Failures are not cached, so the next call retries.
     """
     where = where or DEFAULT_WHERE
     rpp = results_per_page or DEFAULT_RESULTS_PER_PAGE
+    max_days_old = max_days_old or ADZUNA_MAX_DAYS_OLD
 
-    key = _cache_key(query, where, page_num, rpp)
-    cached = _cache_get(key)
+    key = _cache_key(query, where, page_num, rpp, max_days_old)
+    cached = _cache.get(key)
     if cached is not None:
         return cached
 
-    raw = _adzuna_request(query, where, page_num, rpp)
+    raw = _adzuna_request(query, where, page_num, rpp, max_days_old)
+    if raw is None:
+        return None
     mapped: List[Dict[str, Any]] = []
     for it in raw:
         title = it.get("title") or ""
@@ -350,6 +605,7 @@ def search_jobs_by_query(query: str, page_num: int = 1, where: Optional[str] = N
             "url": url,
             "posted_at": created,
             # Legacy keys used elsewhere in pipeline
+            "job_id": str(it.get("id") or ""),
             "job_title": title,
             "employer_name": company,
             "job_city": city,
@@ -359,14 +615,35 @@ def search_jobs_by_query(query: str, page_num: int = 1, where: Optional[str] = N
             "job_posted_at_datetime_utc": created,
         })
 
-    _cache_set(key, mapped)
+    _cache.set(key, mapped)
     return mapped
 
 
-def search_all_jobs() -> List[Dict[str, Any]]:
-    """AI/ML focused job search with strategic queries (2 pages each) via Adzuna."""
-    all_jobs: List[Dict[str, Any]] = []
+def _fetch_page(query: str, page: int, max_days_old: Optional[int]) -> Optional[List[Dict[str, Any]]]:
+    page_jobs = search_jobs_by_query(
+        query, page, where=DEFAULT_WHERE, results_per_page=SCAN_RESULTS_PER_REQUEST, max_days_old=max_days_old
+    )
+    if page_jobs:
+        print(f"  {query} - page {page}: {len(page_jobs)} jobs")
+    return page_jobs
+
+
+def search_all_jobs(max_days_old: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """AI/ML focused job search with strategic queries (SCAN_RESULTS_WANTED results each) via Adzuna.
+
+    Each query asks for as many results per request as Adzuna allows, so the default
+    budget is a single request per query. All (query, page) fetches share one thread pool
+    so network waits overlap. Page 1 of every query goes out first; later pages are only
+    requested for queries whose first page came back full, so sparse queries don't burn quota. The local rate guard in
+    `_adzuna_request` still caps the request volume. Fetches still running after
+    SCAN_DEADLINE_SECONDS are abandoned and the partial results returned.
 
+    `max_days_old` narrows Adzuna's date filter (default ADZUNA_MAX_DAYS_OLD); scans pass
+    the window from `_scan_window_days`.
+
+    Returns the jobs and the number of page fetches that failed, were refused by a local
+    limit or missed the deadline. Zero means every requested page came back.
+    """
     ai_ml_queries = [
         # Entry-level AI/ML roles
         "junior machine learning engineer",
@@ -383,117 +660,140 @@ def search_all_jobs() -> List[Dict[str, Any]]:
         "llm engineer entry level",
     ]
 
-    for query in ai_ml_queries:
-        print(f"Searching: {query} in {DEFAULT_WHERE}")
-        for page in range(1, 3):  # Pages 1-2
-            jobs = search_jobs_by_query(query, page, where=DEFAULT_WHERE, results_per_page=DEFAULT_RESULTS_PER_PAGE)
-            if jobs:
-                all_jobs.extend(jobs)
-                print(f"  Page {page}: {len(jobs)} jobs")
+    print(f"Searching {len(ai_ml_queries)} queries in {DEFAULT_WHERE}")
+    deadline = time.monotonic() + SCAN_DEADLINE_SECONDS
+    results: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}
+    failed = 0
+    pool = ThreadPoolExecutor(max_workers=max(1, SCAN_MAX_WORKERS))
+
+    def run_wave(wave: List[Tuple[str, int]]) -> int:
+        """Fetch a batch of (query, page) pairs; returns how many missed the deadline."""
+        nonlocal failed
+        futures = {pool.submit(_fetch_page, q, p, max_days_old): (q, p) for q, p in wave}
+        done, pending = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+        for fut in done:
+            try:
+                page_jobs = fut.result()
+            except Exception as e:
+                print(f"Error during search: {e}")
+                page_jobs = None
+            if page_jobs is None:
+                failed += 1
             else:
-                break
-            time.sleep(0.3)  # gentle pacing per page
-        time.sleep(0.8)  # pacing per query
+                results[futures[fut]] = page_jobs
+        return len(pending)
+
+    try:
+        skipped = run_wave([(q, 1) for q in ai_ml_queries])
+        if not skipped and SCAN_REQUESTS_PER_QUERY > 1:
+            skipped = run_wave([
+                (q, p)
+                for q in ai_ml_queries
+                if len(results.get((q, 1)) or ()) >= SCAN_RESULTS_PER_REQUEST
+                for p in range(2, SCAN_REQUESTS_PER_QUERY + 1)
+            ])
+    finally:
+        # Don't block on stragglers: drop queued work and keep whatever finished in time
+        pool.shutdown(wait=False, cancel_futures=True)
+    if skipped:
+        print(f"Scan deadline ({SCAN_DEADLINE_SECONDS:.0f}s) hit; {skipped} page fetches skipped")
+
+    # Overlapping queries return the same postings; keep the first copy of each Adzuna id
+    # so duplicates never reach the eligibility filter
+    all_jobs: List[Dict[str, Any]] = []
+    seen_ids: Set[str] = set()
+    for q in ai_ml_queries:
+        for p in range(1, SCAN_REQUESTS_PER_QUERY + 1):
+            for job in results.get((q, p)) or ():
+                job_id = job.get("job_id")
+                if job_id:
+                    if job_id in seen_ids:
+                        continue
+                    seen_ids.add(job_id)
+                all_jobs.append(job)
 
     print(f"Total AI/ML jobs collected: {len(all_jobs)}")
-    return all_jobs
+    if failed:
+        print(f"{failed} page fetches failed or were refused")
+    return all_jobs, failed + skipped
 
 
 # ------------------------ Filtering ------------------------
 
 def is_eligible_job(job: Dict[str, Any]) -> Tuple[bool, str]:
     """Strict filter for AI/ML jobs requiring 0-1.5 years experience maximum."""
-    title = (job.get("job_title") or job.get("title") or "").lower()
-    description = (job.get("job_description") or job.get("description") or "").lower()
-    combined_text = f"{title} {description}"
+    title = job.get("job_title") or job.get("title") or ""
+    description = job.get("job_description") or job.get("description") or ""
+    if ELIGIBILITY_DESC_CHARS > 0:
+        # Requirements sit near the top of a posting; skip scanning boilerplate further down
+        description = description[:ELIGIBILITY_DESC_CHARS]
+    return _check_eligibility(title, description)
+
+
+# Keyed by content rather than job id, so an edited posting is evaluated again
+@lru_cache(maxsize=8192)
+def _check_eligibility(title: str, description: str) -> Tuple[bool, str]:
+    # Casefold once; keyword patterns are casefolded when compiled at import
+    combined_text = f"{title} {description}".casefold()
 
     # 1) Visa/citizenship restrictions (STRICT)
-    for keyword in INELIGIBLE_KEYWORDS:
-        if keyword in combined_text:
-            return False, f"Requires {keyword}"
+    match = _INELIGIBLE_RE.search(combined_text)
+    if match:
+        return False, f"Requires {match.group(0)}"
 
     # 1b) Exclude co-op and student-enrollment requirements
-    for keyword in EXCLUDE_ENROLLMENT_KEYWORDS:
-        if keyword in combined_text:
-            return False, "Co-op or student enrollment required"
+    if _ENROLLMENT_RE.search(combined_text):
+        return False, "Co-op or student enrollment required"
 
-    # 1c) Exclude intern/internship roles (word-boundary to avoid 'internal')
-    if re.search(r"\b(intern|internship|summer intern|fall intern|winter intern|spring intern)\b", combined_text):
+    # 1c) Exclude intern/internship roles
+    if _INTERN_RE.search(combined_text):
         return False, "Intern role (often requires university enrollment)"
 
     # 2) Senior position check (exclude ANY 2+ years indicators)
-    for keyword in SENIOR_KEYWORDS:
-        if keyword in combined_text:
-            return False, f"Too much experience required: {keyword}"
+    match = _SENIOR_RE.search(combined_text)
+    if match:
+        return False, f"Too much experience required: {match.group(0)}"
 
     # 3) Reject explicit multi-year experience (EN/FR) >= 2 years
-    # English patterns: e.g., "2 years", "3+ yrs", "at least 2 years"
-    en_years = re.search(r"\b(2|3|4|5|6|7|8|9|10)\s*\+?\s*(years?|yrs)\b", combined_text)
+    # English: judged on the lower bound, so "0-2 years" and "1.5 years" pass but "3-5 yrs" does not
+    for match in _YEARS_RE.finditer(combined_text):
+        if float(match.group(1)) >= 2:
+            return False, f"Too much experience required: {match.group(0)}"
     # French patterns: e.g., "2 ans d'expérience"
-    fr_years = re.search(r"\b(2|3|4|5|6|7|8|9|10)\s*(ans)\b.*expérien|experience", combined_text)
-    if en_years or fr_years:
+    if _FR_YEARS_RE.search(combined_text):
         return False, "Requires >= 2 years experience"
 
     # II/III/IV levels in title often indicate non-junior
-    if re.search(r"\b(ii|iii|iv)\b", title):
+    if _LEVEL_RE.search(title):
         return False, "Non-junior level indicated (II/III/IV)"
 
     # 4) Relevant AI/ML/Data role keywords (STRICT)
-    role_matches = [kw for kw in ROLE_KEYWORDS if kw in combined_text]
-    if not role_matches:
-        ai_ml_terms = [
-            "artificial intelligence", "machine learning", "data science", "data analyst",
-            "deep learning", "neural network", "computer vision", "natural language",
-            "nlp", "data mining", "predictive analytics", "statistical analysis",
-            "big data", "data engineer", "business intelligence", "analytics",
-            "llm", "generative ai", "chatbot", "recommendation system", "ai agent",
-            "prompt engineering", "mlops", "data pipeline", "etl", "sql",
-        ]
-        if any(term in combined_text for term in ai_ml_terms):
-            role_matches = ["ai/ml/data-related"]
+    match = _ROLE_RE.search(combined_text)
+    role = match.group(0) if match else ""
+    if not role:
+        if _AI_ML_TERMS_RE.search(combined_text):
+            role = "ai/ml/data-related"
         else:
             return False, "No relevant AI/ML/Data role keywords found"
 
     # 5) Explicit entry-level indicators (strong accept)
-    entry_level_matches = [kw for kw in EXPERIENCE_KEYWORDS if kw in combined_text]
-    if entry_level_matches:
-        return True, f"{role_matches[0]} - {entry_level_matches[0]}"
+    match = _EXPERIENCE_RE.search(combined_text)
+    if match:
+        return True, f"{role} - {match.group(0)}"
 
     # 6) Acceptable explicit ranges (0-1.5 yrs)
-    acceptable_experience = [
-        "0-1 years", "0-1.5 years", "1-1.5 years", "0 to 1", "0 to 1.5",
-        "up to 1", "up to 1.5", "less than 2", "under 2 years", "1 year",
-        "one year", "18 months", "0-18 months", "1.5 years max", "maximum 1.5",
-    ]
-    if any(exp in combined_text for exp in acceptable_experience):
-        return True, f"{role_matches[0]} (acceptable experience: 0-1.5 years)"
+    if _ACCEPTABLE_EXPERIENCE_RE.search(combined_text):
+        return True, f"{role} (acceptable experience: 0-1.5 years)"
 
     # 7) Potentially problematic experience mentions
-    problematic_experience = [
-        "2 years", "3 years", "4 years", "5 years", "years of experience",
-        "years experience", "minimum years", "must have experience",
-        "required experience", "proven experience", "extensive experience",
-        "solid experience", "strong experience", "professional experience",
-    ]
-    if any(exp in combined_text for exp in problematic_experience):
-        flexible_terms = [
-            "preferred but not required", "nice to have", "bonus", "plus",
-            "would be great", "ideal but not required", "strongly preferred but not required",
-            "some experience helpful", "any experience welcome", "little experience ok",
-            "entry level welcome", "new graduates welcome", "fresh graduates welcome",
-        ]
-        if any(flex in combined_text for flex in flexible_terms):
-            return True, f"{role_matches[0]} (flexible experience - entry level welcome)"
+    if _PROBLEMATIC_EXPERIENCE_RE.search(combined_text):
+        if _FLEXIBLE_TERMS_RE.search(combined_text):
+            return True, f"{role} (flexible experience - entry level welcome)"
         return False, "Experience requirements unclear - likely requires >1.5 years"
 
     # 8) Training/graduate program indicators
-    entry_indicators = [
-        "training provided", "will train", "learn on job", "mentorship",
-        "graduate program", "rotational program", "development program",
-        "internship program", "apprenticeship", "on the job training",
-    ]
-    if any(ind in combined_text for ind in entry_indicators):
-        return True, f"{role_matches[0]} (training provided - good for new grads)"
+    if _ENTRY_INDICATORS_RE.search(combined_text):
+        return True, f"{role} (training provided - good for new grads)"
 
     # 9) Conservative default: if not explicitly entry-level, reject as ambiguous
     return False, "Ambiguous experience requirements (not clearly entry-level)"
@@ -501,72 +801,140 @@ def is_eligible_job(job: Dict[str, Any]) -> Tuple[bool, str]:
 
 # ------------------------ Email ------------------------
 
-def send_email(new_jobs: List[Dict[str, Any]], run_info: Dict[str, Any]) -> None:
-    if not new_jobs:
-        return
-
-    try:
-        msg = MIMEMultipart()
-        msg["From"] = SENDER_EMAIL
-        msg["To"] = ", ".join(RECIPIENT_EMAILS)
-        msg["Subject"] = f"{len(new_jobs)} New Job Matches Found! - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-
-        html_body = f"""
+# Digest templates, parsed once; every interpolated job field is HTML-escaped first
+_EMAIL_HEADER_TMPL = """
         <html>
         <body>
             <h2>New Job Opportunities Found!</h2>
-            <p><strong>Scan Time:</strong> {datetime.now().strftime('%Y-%m-%d at %H:%M')}</p>
-            <p><strong>New Matches:</strong> {len(new_jobs)}</p>
-            <p><strong>Total Jobs Scanned:</strong> {run_info.get('total_jobs_scanned', 'Unknown')}</p>
+            <p><strong>Scan Time:</strong> {scan_time}</p>
+            <p><strong>New Matches:</strong> {count}</p>
+            <p><strong>Total Jobs Scanned:</strong> {scanned}</p>
             <h3>Job Matches:</h3>
         """
 
-        for i, job in enumerate(new_jobs, 1):
-            html_body += f"""
+_EMAIL_JOB_TMPL = """
             <div style="border:1px solid #ddd; padding:15px; margin:10px 0; border-radius:5px;">
-                <h4 style="color:#2c3e50; margin:0 0 10px 0;">{i}. {job['title']}</h4>
-                <p><strong>Company:</strong> {job['company']}</p>
-                <p><strong>Location:</strong> {job['location']}</p>
-                <p><strong>Why Matched:</strong> <em>{job['why_matched']}</em></p>
-                <p><strong>Apply:</strong> <a href="{job['url']}" target="_blank">View Job Posting</a></p>
+                <h4 style="color:#2c3e50; margin:0 0 10px 0;">{i}. {title}</h4>
+                <p><strong>Company:</strong> {company}</p>
+                <p><strong>Location:</strong> {location}</p>
+                <p><strong>Why Matched:</strong> <em>{why_matched}</em></p>
+                <p><strong>Apply:</strong> <a href="{url}" target="_blank">View Job Posting</a></p>
             </div>
             """
 
-        html_body += f"""
+_EMAIL_FOOTER_TMPL = """
             <p style="color:#7f8c8d; font-size:12px; margin-top:30px;">
-                This automated job alert was sent to {len(RECIPIENT_EMAILS)} recipient(s).<br>
+                This automated job alert was sent to {recipients} recipient(s).<br>
                 Jobs are filtered for AI/Tech roles suitable for fresh graduates in Canada.
             </p>
         </body>
         </html>
         """
 
-        msg.attach(MIMEText(html_body, "html"))
 
-        def _send_via_tls(port: int) -> None:
-            with smtplib.SMTP(SMTP_SERVER, port, timeout=SMTP_TIMEOUT) as server:
-                if SMTP_USE_TLS:
-                    server.starttls()
-                server.login(SENDER_EMAIL, SENDER_PASSWORD)
-                server.sendmail(SENDER_EMAIL, RECIPIENT_EMAILS, msg.as_string())
+def _open_smtp() -> smtplib.SMTP:
+    """Connect and log in, falling back from Gmail's TLS:587 to SSL:465."""
+    def _via_tls(port: int) -> smtplib.SMTP:
+        server = smtplib.SMTP(SMTP_SERVER, port, timeout=SMTP_TIMEOUT)
+        try:
+            if SMTP_USE_TLS:
+                server.starttls()
+            server.login(SENDER_EMAIL, SENDER_PASSWORD)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _via_ssl(port: int) -> smtplib.SMTP:
+        server = smtplib.SMTP_SSL(SMTP_SERVER, port, timeout=SMTP_TIMEOUT)
+        try:
+            server.login(SENDER_EMAIL, SENDER_PASSWORD)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    if SMTP_USE_SSL or SMTP_PORT == 465:
+        return _via_ssl(SMTP_PORT)
+    try:
+        return _via_tls(SMTP_PORT)
+    except Exception:
+        # Fallback for Gmail: try SSL:465 if TLS:587 failed
+        if ("gmail.com" in SMTP_SERVER) and SMTP_PORT == 587:
+            return _via_ssl(465)
+        raise
+
 
-        def _send_via_ssl(port: int) -> None:
-            with smtplib.SMTP_SSL(SMTP_SERVER, port, timeout=SMTP_TIMEOUT) as server:
-                server.login(SENDER_EMAIL, SENDER_PASSWORD)
-                server.sendmail(SENDER_EMAIL, RECIPIENT_EMAILS, msg.as_string())
+def _smtp_send(message: Message) -> None:
+    """Send over the cached SMTP session, reconnecting if the server dropped it.
 
-        local_port = SMTP_PORT
+    send_message flattens the MIME tree to bytes itself, skipping the as_string() copy.
+    """
+    global _smtp_conn
+    with _smtp_lock:
+        server = _smtp_conn
+        if server is not None:
+            try:
+                if server.noop()[0] != 250:
+                    raise smtplib.SMTPServerDisconnected("NOOP rejected")
+            except (smtplib.SMTPException, OSError):
+                close_smtp_connection()
+                server = None
+        if server is None:
+            server = _smtp_conn = _open_smtp()
         try:
-            if SMTP_USE_SSL or local_port == 465:
-                _send_via_ssl(local_port)
-            else:
-                _send_via_tls(local_port)
-        except Exception as e1:
-            # Fallback for Gmail: try SSL:465 if TLS:587 failed
-            if ("gmail.com" in SMTP_SERVER) and not SMTP_USE_SSL and local_port == 587:
-                _send_via_ssl(465)
-            else:
-                raise e1
+            server.send_message(message, from_addr=SENDER_EMAIL, to_addrs=RECIPIENT_EMAILS)
+        except smtplib.SMTPServerDisconnected:
+            close_smtp_connection()
+            server = _smtp_conn = _open_smtp()
+            server.send_message(message, from_addr=SENDER_EMAIL, to_addrs=RECIPIENT_EMAILS)
+
+
+def close_smtp_connection() -> None:
+    global _smtp_conn
+    with _smtp_lock:
+        if _smtp_conn is not None:
+            try:
+                _smtp_conn.quit()
+            except (smtplib.SMTPException, OSError):
+                _smtp_conn.close()
+            _smtp_conn = None
+
+
+def send_email(new_jobs: List[Dict[str, Any]], run_info: Dict[str, Any]) -> None:
+    if not new_jobs:
+        return
+
+    try:
+        msg = MIMEMultipart()
+        msg["From"] = SENDER_EMAIL
+        msg["To"] = ", ".join(RECIPIENT_EMAILS)
+        sent_at = datetime.now()
+        msg["Subject"] = f"{len(new_jobs)} New Job Matches Found! - {sent_at.strftime('%Y-%m-%d %H:%M')}"
+
+        html_body = "".join([
+            _EMAIL_HEADER_TMPL.format(
+                scan_time=sent_at.strftime("%Y-%m-%d at %H:%M"),
+                count=len(new_jobs),
+                scanned=html.escape(str(run_info.get("total_jobs_scanned", "Unknown"))),
+            ),
+            *(
+                _EMAIL_JOB_TMPL.format(
+                    i=i,
+                    title=html.escape(str(job["title"])),
+                    company=html.escape(str(job["company"])),
+                    location=html.escape(str(job["location"])),
+                    why_matched=html.escape(str(job["why_matched"])),
+                    url=html.escape(str(job["url"])),
+                )
+                for i, job in enumerate(new_jobs, 1)
+            ),
+            _EMAIL_FOOTER_TMPL.format(recipients=len(RECIPIENT_EMAILS)),
+        ])
+
+        msg.attach(MIMEText(html_body, "html"))
+
+        _smtp_send(msg)
 
         print(f"Email sent to {len(RECIPIENT_EMAILS)} recipients with {len(new_jobs)} matches")
         print(f"Recipients: {', '.join(RECIPIENT_EMAILS)}")
@@ -575,86 +943,185 @@ def send_email(new_jobs: List[Dict[str, Any]], run_info: Dict[str, Any]) -> None
         print(f"Error sending email: {e}")
 
 
+def send_email_in_background(new_jobs: List[Dict[str, Any]], run_info: Dict[str, Any]) -> threading.Thread:
+    """Start send_email on its own thread and return it so callers may join."""
+    mailer = threading.Thread(target=send_email, args=(new_jobs, run_info), name="send-email")
+    mailer.start()
+    return mailer
+
+
 # ------------------------ Scan & schedule ------------------------
 
-def scan_jobs_automated() -> None:
-    print(f"\nStarting automated job scan at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+SCAN_WATERMARK_KEY = "scan_watermark"
 
+
+def _scan_window_days(now_utc: datetime) -> int:
+    """Adzuna max_days_old for a scan: back to the last completed scan plus SCAN_OVERLAP_HOURS,
+    in whole days, capped at ADZUNA_MAX_DAYS_OLD (also used when no scan has completed yet)."""
+    raw = get_seen_store().get_meta(SCAN_WATERMARK_KEY)
     try:
-        # Load seen jobs and cleanup old ones
-        seen_jobs_data = load_seen_jobs()
-        seen_jobs_data = cleanup_old_jobs(seen_jobs_data)
+        since = datetime.fromisoformat(raw) if raw else None
+    except ValueError:
+        since = None
+    if since is None:
+        return ADZUNA_MAX_DAYS_OLD
+    hours = (now_utc - since).total_seconds() / 3600 + SCAN_OVERLAP_HOURS
+    return max(1, min(ADZUNA_MAX_DAYS_OLD, math.ceil(hours / 24)))
 
-        # Search for new jobs
-        raw_jobs = search_all_jobs()
-        if not raw_jobs:
-            print("No jobs found from API")
-            return
 
-        new_jobs: List[Dict[str, Any]] = []
-        today = datetime.now().strftime("%Y-%m-%d")
+def _advance_scan_watermark(started_utc: datetime) -> None:
+    """Record a completed scan; the next one only asks for postings from around then on."""
+    get_seen_store().set_meta(SCAN_WATERMARK_KEY, started_utc.isoformat())
 
-        for job in raw_jobs:
-            title = job.get("job_title") or job.get("title") or "Unknown Title"
-            company = job.get("employer_name") or job.get("company") or "Unknown Company"
-            city = job.get("job_city") or ""
-            country = job.get("job_country") or ""
-            location = f"{city}, {country}".strip(", ") if city or country else job.get("location") or ""
-            url = job.get("job_apply_link") or job.get("url") or ""
-            posted_at = job.get("job_posted_at_datetime_utc") or job.get("posted_at") or ""
 
-            # Freshness guard
-            if not is_fresh_job(posted_at, JOB_MAX_AGE_DAYS):
-                continue
+def _job_signature(title: str, company: str) -> Tuple[str, str]:
+    """Key shared by location variants of one posting: company plus title prefix."""
+    return company.lower(), title.lower()[:40]
+
 
-            job_hash = create_job_hash(title, company, location)
-            if job_hash in seen_jobs_data["seen_jobs"]:
+def _process_raw_jobs(raw_jobs: List[Dict[str, Any]], now: datetime) -> Tuple[List[Dict[str, Any]], int]:
+    """Filter a scan batch against the seen store and record the new matches in it.
+
+    Shared by the scheduled scan and /api/scan; callers decide how to notify.
+    Returns the new matches and the store size afterwards.
+    """
+    today = now.strftime("%Y-%m-%d")
+    now_utc = now.astimezone(timezone.utc)
+    new_jobs: List[Dict[str, Any]] = []
+
+    # Extract fields and keys for fresh postings first so the store is queried once per batch
+    candidates: List[Tuple[Dict[str, Any], str, str, str, str, str]] = []
+    for job in raw_jobs:
+        title = job.get("job_title") or job.get("title") or "Unknown Title"
+        company = job.get("employer_name") or job.get("company") or "Unknown Company"
+        city = job.get("job_city") or ""
+        country = job.get("job_country") or ""
+        location = f"{city}, {country}".strip(", ") if city or country else job.get("location") or ""
+        url = job.get("job_apply_link") or job.get("url") or ""
+        posted_at = job.get("job_posted_at_datetime_utc") or job.get("posted_at") or ""
+
+        # Freshness guard
+        if not is_fresh_job(posted_at, JOB_MAX_AGE_DAYS, now_utc):
+            continue
+
+        candidates.append((job, title, company, location, url, create_job_hash(title, company, location)))
+
+    with _seen_lock:
+        # Prune old entries from the store (at most hourly)
+        store = _cleanup_seen_jobs_if_due(now)
+        known = store.known(c[5] for c in candidates)
+        rejected_before = store.rejected_fingerprints(c[5] for c in candidates if c[5] not in known)
+        touched: Set[str] = set()
+        added: List[SeenRow] = []
+        rejected: List[RejectedRow] = []
+        batch_seen: Set[str] = set()
+        # Template variants of one posting share a company and title prefix but differ in
+        # location. Only the first eligible variant in this batch is emailed.
+        sent_signatures: Set[Tuple[str, str]] = set()
+
+        for job, title, company, location, url, job_hash in candidates:
+            if job_hash in known:
                 # Update last_seen
-                seen_jobs_data["seen_jobs"][job_hash]["last_seen"] = today
+                touched.add(job_hash)
+                continue
+
+            # Skip exact repeats within this scan before the keyword scan
+            if job_hash in batch_seen:
+                continue
+            batch_seen.add(job_hash)
+
+            # Same posting, same content, same rules as an earlier rejection: skip the filter
+            fingerprint = content_fingerprint(job)
+            if rejected_before.get(job_hash) == fingerprint:
+                rejected.append((job_hash, fingerprint))
                 continue
 
             is_ok, reason = is_eligible_job(job)
-            if is_ok:
-                job_info = {
-                    "title": title,
-                    "company": company,
-                    "location": location if location else "Remote/Unknown",
-                    "url": url,
-                    "why_matched": reason,
-                }
-                new_jobs.append(job_info)
-
-                seen_jobs_data["seen_jobs"][job_hash] = {
-                    "title": title,
-                    "company": company,
-                    "location": job_info["location"],
-                    "first_seen": today,
-                    "last_seen": today,
-                    "url": url,
-                }
-
-        # Update last scan time & persist
-        seen_jobs_data["last_updated"] = datetime.now().isoformat()
-        save_seen_jobs(seen_jobs_data)
-
-        run_info = {
-            "total_jobs_scanned": len(raw_jobs),
-            "new_matches": len(new_jobs),
-            "total_in_memory": len(seen_jobs_data["seen_jobs"]),
-        }
+            if not is_ok:
+                rejected.append((job_hash, fingerprint))
+            else:
+                # A variant of a posting emailed in this batch is stored as seen but not emailed,
+                # so it stays out of later scans too
+                signature = _job_signature(title, company)
+                if signature not in sent_signatures:
+                    sent_signatures.add(signature)
+                    new_jobs.append({
+                        "title": title,
+                        "company": company,
+                        "location": location or UNKNOWN_LOCATION,
+                        "url": url,
+                        "why_matched": reason,
+                    })
+                added.append((job_hash, title, company, location or UNKNOWN_LOCATION, today, today, url))
+
+        # One transaction: last_seen bumps, new rows, rejections and the last scan time
+        store.record_scan(today, list(touched), added, now.isoformat(), rejected)
+        return new_jobs, store.count()
+
+
+@contextmanager
+def _scan_guard() -> Iterator[bool]:
+    """Yield True while holding SCAN_LOCK, or False straight away if another scan holds it."""
+    if not SCAN_LOCK.acquire(blocking=False):
+        yield False
+        return
+    SCAN_STATE.update(running=True, started_at=datetime.now(timezone.utc).isoformat())
+    try:
+        yield True
+    finally:
+        SCAN_STATE.update(running=False, last_finished_at=datetime.now(timezone.utc).isoformat())
+        SCAN_LOCK.release()
 
-        print(f"Scan complete: {len(new_jobs)} new matches from {len(raw_jobs)} jobs scanned")
 
-        if new_jobs:
-            send_email(new_jobs, run_info)
-        else:
-            print("No new eligible jobs found")
+def scan_jobs_automated(wait_for_email: bool = True) -> None:
+    """Scan, record and email new matches; endpoints pass wait_for_email=False to skip the SMTP wait."""
+    with _scan_guard() as acquired:
+        if not acquired:
+            print("Scan already in progress; skipping this run")
+            return
 
-    except Exception as e:
-        print(f"Error in automated scan: {e}")
+        # One clock read per scan; every timestamp below is derived from it
+        now = datetime.now()
+        print(f"\nStarting automated job scan at {now.strftime('%Y-%m-%d %H:%M:%S')}")
+
+        try:
+            # Search for jobs posted since the last completed scan
+            now_utc = now.astimezone(timezone.utc)
+            raw_jobs, incomplete = search_all_jobs(max_days_old=_scan_window_days(now_utc))
+            if not raw_jobs:
+                # A complete scan that found nothing still narrows the next window
+                if not incomplete:
+                    _advance_scan_watermark(now_utc)
+                print("No jobs found from API")
+                return
+
+            new_jobs, total_seen = _process_raw_jobs(raw_jobs, now)
+            # A partial scan keeps the old watermark so the next one covers the gaps
+            if not incomplete:
+                _advance_scan_watermark(now_utc)
+
+            run_info = {
+                "total_jobs_scanned": len(raw_jobs),
+                "new_matches": len(new_jobs),
+                "total_in_memory": total_seen,
+            }
+
+            print(f"Scan complete: {len(new_jobs)} new matches from {len(raw_jobs)} jobs scanned")
+
+            # The store is written first, then the email goes out on its own thread; it does
+            # not overlap the write, it only lets endpoints return without waiting on SMTP
+            mailer = send_email_in_background(new_jobs, run_info) if new_jobs else None
+            if mailer is None:
+                print("No new eligible jobs found")
+            elif wait_for_email:
+                mailer.join()
+
+        except Exception as e:
+            print(f"Error in automated scan: {e}")
 
 
 def schedule_jobs() -> None:
+    schedule.clear()  # a restarted scheduler must not register the runs twice
     schedule.every().day.at("08:00").do(scan_jobs_automated)
     schedule.every().day.at("12:37").do(scan_jobs_automated)
     schedule.every().day.at("17:00").do(scan_jobs_automated)
@@ -662,20 +1129,35 @@ def schedule_jobs() -> None:
 
     print("Job scheduler initialized - 8:00, 12:37, 17:00, 23:00 daily")
 
-    while True:
+    while not _scheduler_stop.is_set():
         schedule.run_pending()
-        time.sleep(60)
+        # Block straight through to the next due run instead of waking every minute;
+        # stop_scheduler() sets the event to end the wait early
+        idle = schedule.idle_seconds()
+        _scheduler_stop.wait(max(1.0, idle) if idle is not None else 60)
 
 
 def start_scheduler() -> None:
-    scheduler_thread = threading.Thread(target=schedule_jobs, daemon=True)
-    scheduler_thread.start()
+    global _scheduler_thread
+    _scheduler_stop.clear()
+    _scheduler_thread = threading.Thread(target=schedule_jobs, name="job-scheduler", daemon=True)
+    _scheduler_thread.start()
+
+
+def stop_scheduler(timeout: float = 5.0) -> None:
+    """Wake the scheduler thread and let it exit (an in-flight scan is not interrupted)."""
+    global _scheduler_thread
+    _scheduler_stop.set()
+    if _scheduler_thread is not None:
+        _scheduler_thread.join(timeout)
+        _scheduler_thread = None
 
 
 # ------------------------ FastAPI lifecycle & routes ------------------------
 
 @app.on_event("startup")
 async def startup_event():
+    get_seen_store()  # open (and migrate) the seen-jobs store once, off the request path
     if ENABLE_SCHEDULER:
         start_scheduler()
         print("Job scanner started with automatic scheduling")
@@ -683,6 +1165,14 @@ async def startup_event():
         print("In-process scheduler disabled (ENABLE_SCHEDULER=false)")
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    stop_scheduler()
+    close_seen_store()
+    close_smtp_connection()
+    _daily_budget.close()
+
+
 @app.get("/")
 def root():
     return {"ok": True, "message": "Fresh Graduate Job Scanner API", "ts": datetime.now(timezone.utc).isoformat()}
@@ -690,35 +1180,84 @@ def root():
 
 @app.get("/api/health")
 def health():
-    return {"status": "up", "ts": datetime.now(timezone.utc).isoformat()}
+    return {"status": "up", "ts": datetime.now(timezone.utc).isoformat(), "scan": dict(SCAN_STATE)}
 
 
 # ------------------------ Unified jobs endpoint ------------------------
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
 def _normalize_where(where: Optional[str]) -> str:
     if where and where.strip():
-        return where.strip()
+        return _WHITESPACE_RE.sub(" ", where.strip())
     return "Toronto, ON, Canada"
 
 
+def _normalize_terms(what: str, where: Optional[str]) -> Tuple[str, str]:
+    """Casefold, collapse whitespace and intern search terms once per request so adapters can key
+    their caches on them directly ("data  analyst" and "Data analyst" share an entry)."""
+    what = _WHITESPACE_RE.sub(" ", what.strip())
+    return sys.intern(what.casefold()), sys.intern(_normalize_where(where).casefold())
+
+
+def _search_providers(adapters: Tuple[Any, ...], what: str, where: str, page: int,
+                      results_per_page: int) -> List[Tuple[str, List[JobItem]]]:
+    """Query `adapters` concurrently and return (source, items) for each that answered, in order.
+
+    A provider that raises or overruns settings.provider_timeout_seconds is skipped; its call
+    keeps running in the pool and still fills the cache for the next request.
+    """
+    futures = [(a.source_name, _provider_pool.submit(a.search, what, where, page, results_per_page)) for a in adapters]
+    deadline = time.monotonic() + settings.provider_timeout_seconds
+    results: List[Tuple[str, List[JobItem]]] = []
+    for name, future in futures:
+        try:
+            items = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FuturesTimeout:
+            print(f"{name} did not answer within {settings.provider_timeout_seconds:g}s; skipping")
+            continue
+        except Exception as e:
+            print(f"{name} search failed: {e}")
+            continue
+        if items:
+            results.append((name, items))
+    return results
+
+
+def _dedup_key(it: JobItem) -> Tuple[str, str, str]:
+    return ((it.title or "").strip().lower(), (it.company or "").strip().lower(), (it.location or "").strip().lower())
+
+
 def _dedup(items: List[JobItem]) -> List[JobItem]:
-    seen: Dict[str, JobItem] = {}
+    # Tuple keys hash the three fields directly instead of building a joined string per item
+    seen: Set[Tuple[str, str, str]] = set()
+    out: List[JobItem] = []
     for it in items:
-        key = f"{(it.title or '').strip().lower()}|{(it.company or '').strip().lower()}|{(it.location or '').strip().lower()}"
+        key = _dedup_key(it)
         if key not in seen:
-            seen[key] = it
-    return list(seen.values())
+            seen.add(key)
+            out.append(it)
+    return out
+
+
+# Strong positives and their weights
+_SCORE_LEVEL_TERMS = (("junior", 5.0), ("entry level", 5.0), ("new grad", 4.0), ("graduate", 3.5), ("associate", 3.0))
+# Relevance terms, +1.2 each
+_SCORE_RELEVANCE_TERMS = (
+    "machine learning", "data scientist", "data analyst", "ml", "ai", "llm", "computer vision", "nlp", "analytics",
+)
 
 
 def _score(item: JobItem, now: datetime) -> float:
-    text = f"{item.title.lower()} {item.description.lower()}"
+    text = f"{item.title} {item.description}".lower()
     score = 0.0
     # Strong positives
-    for kw, pts in [("junior", 5.0), ("entry level", 5.0), ("new grad", 4.0), ("graduate", 3.5), ("associate", 3.0)]:
+    for kw, pts in _SCORE_LEVEL_TERMS:
         if kw in text:
             score += pts
     # Relevance
-    for kw in ["machine learning", "data scientist", "data analyst", "ml", "ai", "llm", "computer vision", "nlp", "analytics"]:
+    for kw in _SCORE_RELEVANCE_TERMS:
         if kw in text:
             score += 1.2
     # Recency
@@ -744,116 +1283,70 @@ def get_jobs(
 ):
     """Return merged, deduped, ranked Canadian job postings from JSearch, Jooble, and Adzuna.
 
-    Strategy: query JSearch first. If results < MIN_RESULTS_PRIMARY, query Jooble, then Adzuna.
-    Local caching and rate guards keep total daily calls within ~80/day.
+    Strategy: query JSearch first. If results < MIN_RESULTS_PRIMARY, query Jooble and Adzuna
+    concurrently. Local caching and rate guards keep total daily calls within ~80/day.
     """
     now = datetime.now(timezone.utc)
-    where_val = _normalize_where(where)
+    what, where_val = _normalize_terms(what, where)
 
     all_items: List[JobItem] = []
     sources_called: List[str] = []
 
-    # Primary: JSearch
-    j_items = _jsearch.search(what, where_val, page, results_per_page)
-    if j_items:
-        all_items.extend(j_items)
-        sources_called.append("jsearch")
-
-    # If not enough, call Jooble
-    if len(all_items) < settings.min_results_primary:
-        jo_items = _jooble.search(what, where_val, page, results_per_page)
-        if jo_items:
-            all_items.extend(jo_items)
-            sources_called.append("jooble")
-
-    # If still not enough, call Adzuna
-    if len(all_items) < settings.min_results_primary:
-        ad_items = _adzuna.search(what, where_val, page, results_per_page)
-        if ad_items:
-            all_items.extend(ad_items)
-            sources_called.append("adzuna")
+    # Primary: JSearch, then both fallbacks together if it came up short. Items stay in
+    # provider order, so dedup and ranking ties still favour the primary source.
+    for adapters in ((_jsearch,), (_jooble, _adzuna)):
+        if len(all_items) >= settings.min_results_primary:
+            break
+        for name, items in _search_providers(adapters, what, where_val, page, results_per_page):
+            all_items.extend(items)
+            sources_called.append(name)
 
     # Dedup and rank
     deduped = _dedup(all_items)
-    ranked = sorted(deduped, key=lambda it: _score(it, now), reverse=True)
-    limited = ranked[: settings.max_results]
+    # Same order as a full descending sort, but only the top max_results are kept in the heap
+    limited = heapq.nlargest(settings.max_results, deduped, key=lambda it: _score(it, now))
 
     return {
         "ok": True,
         "sources_called": sources_called,
         "count": len(limited),
-        "items": [it.__dict__ for it in limited],
+        "items": [asdict(it) for it in limited],
     }
 
 
 @app.get("/api/scan")
-def scan():
-    run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-    seen_jobs_data = load_seen_jobs()
-    seen_jobs_data = cleanup_old_jobs(seen_jobs_data)
-
-    raw_jobs = search_all_jobs()
-    if not raw_jobs:
-        return {
-            "run_id": run_id,
-            "count": 0,
-            "matches": [],
-            "message": "No jobs found from API",
-        }
-
-    new_jobs: List[Dict[str, Any]] = []
-    today = datetime.now().strftime("%Y-%m-%d")
+def scan(response: Response):
+    with _scan_guard() as acquired:
+        if not acquired:
+            response.status_code = 409
+            return {"status": "busy", "message": "A scan is already running", "scan": dict(SCAN_STATE)}
 
-    for job in raw_jobs:
-        title = job.get("job_title") or job.get("title") or "Unknown Title"
-        company = job.get("employer_name") or job.get("company") or "Unknown Company"
-        city = job.get("job_city") or ""
-        country = job.get("job_country") or ""
-        location = f"{city}, {country}".strip(", ") if city or country else job.get("location") or ""
-        url = job.get("job_apply_link") or job.get("url") or ""
-        posted_at = job.get("job_posted_at_datetime_utc") or job.get("posted_at") or ""
-
-        # Freshness guard
-        if not is_fresh_job(posted_at, JOB_MAX_AGE_DAYS):
-            continue
+        now = datetime.now()
+        run_id = now.strftime("%Y%m%d_%H%M%S")
 
-        job_hash = create_job_hash(title, company, location)
-        if job_hash in seen_jobs_data["seen_jobs"]:
-            # Update last_seen
-            seen_jobs_data["seen_jobs"][job_hash]["last_seen"] = today
-            continue
-
-        is_ok, reason = is_eligible_job(job)
-        if is_ok:
-            job_info = {
-                "title": title,
-                "company": company,
-                "location": location if location else "Remote/Unknown",
-                "url": url,
-                "why_matched": reason,
-            }
-            new_jobs.append(job_info)
-
-            seen_jobs_data["seen_jobs"][job_hash] = {
-                "title": title,
-                "company": company,
-                "location": job_info["location"],
-                "first_seen": today,
-                "last_seen": today,
-                "url": url,
+        now_utc = now.astimezone(timezone.utc)
+        raw_jobs, incomplete = search_all_jobs(max_days_old=_scan_window_days(now_utc))
+        if not raw_jobs:
+            if not incomplete:
+                _advance_scan_watermark(now_utc)
+            return {
+                "run_id": run_id,
+                "count": 0,
+                "matches": [],
+                "message": "No jobs found from API",
             }
 
-    seen_jobs_data["last_updated"] = datetime.now().isoformat()
-    save_seen_jobs(seen_jobs_data)
+        new_jobs, total_seen = _process_raw_jobs(raw_jobs, now)
+        if not incomplete:
+            _advance_scan_watermark(now_utc)
 
-    return {
-        "run_id": run_id,
-        "count": len(new_jobs),
-        "matches": new_jobs,
-        "total_jobs_scanned": len(raw_jobs),
-        "total_jobs_in_memory": len(seen_jobs_data["seen_jobs"]),
-    }
+        return {
+            "run_id": run_id,
+            "count": len(new_jobs),
+            "matches": new_jobs,
+            "total_jobs_scanned": len(raw_jobs),
+            "total_jobs_in_memory": total_seen,
+        }
 
 
 @app.get("/api/test-email")
@@ -870,13 +1363,14 @@ def test_email():
     return {"message": "Test email sent"}
 
 
-@app.get("/api/force-scan")
-def force_scan():
-    scan_jobs_automated()
-    return {"message": "Forced scan completed"}
+# Both answer 202 straight away and run the full scan + email after the response is sent
+@app.get("/api/force-scan", status_code=202)
+def force_scan(background_tasks: BackgroundTasks):
+    background_tasks.add_task(scan_jobs_automated, wait_for_email=False)
+    return {"status": "queued", "message": "Forced scan started"}
 
 
-@app.get("/api/scan-and-email")
-def scan_and_email():
-    scan_jobs_automated()
-    return {"ok": True, "message": "Scan executed and email attempted"}
+@app.get("/api/scan-and-email", status_code=202)
+def scan_and_email(background_tasks: BackgroundTasks):
+    background_tasks.add_task(scan_jobs_automated, wait_for_email=False)
+    return {"ok": True, "status": "queued", "message": "Scan started; email will follow if there are new matches"}
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Mapping, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_usage (
+    source TEXT NOT NULL,
+    day    TEXT NOT NULL,
+    used   INTEGER NOT NULL,
+    PRIMARY KEY (source, day)
+) WITHOUT ROWID;
+"""
+
+
+class DailyBucket:
+    """Per-source daily call budget counted in a SQLite file.
+
+    The in-memory RateLimiter starts empty in every process, so cron runs, restarts and
+    extra workers each got a fresh day. This count is shared by all of them. Days roll
+    over at UTC midnight; sources without a limit are not counted.
+
+    The file is opened on first use. If it cannot be opened or written (read-only
+    filesystem, locked disk), the budget is switched off with a warning and every call
+    is allowed; the per-process RateLimiter still applies.
+    """
+
+    def __init__(self, path: str, limits: Mapping[str, int]) -> None:
+        self.path = path
+        self.limits = dict(limits)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disabled = False
+        self._day: Optional[str] = None
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the file on first use; None once the budget is disabled. Caller holds _lock."""
+        if self._conn is None and not self._disabled:
+            try:
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(_SCHEMA)
+            except sqlite3.Error as e:
+                self._disable(e)
+            else:
+                self._conn = conn
+        return self._conn
+
+    def _disable(self, error: sqlite3.Error) -> None:
+        print(f"Warning: daily budget file {self.path} unavailable ({error}); daily budgets are off")
+        self._disabled = True
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def try_acquire(self, source: str) -> bool:
+        """Count one call against today's budget for `source`; False once it is spent."""
+        limit = self.limits.get(source)
+        if limit is None:
+            return True
+        if limit <= 0:
+            return False
+        day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return True
+            try:
+                with conn:
+                    if day != self._day:
+                        conn.execute("DELETE FROM daily_usage WHERE day < ?", (day,))
+                        self._day = day
+                    # One statement, so concurrent processes cannot both take the last slot
+                    cur = conn.execute(
+                        "INSERT INTO daily_usage (source, day, used) VALUES (?, ?, 1) "
+                        "ON CONFLICT (source, day) DO UPDATE SET used = used + 1 WHERE used < ?",
+                        (source, day, limit),
+                    )
+            except sqlite3.Error as e:
+                self._disable(e)
+                return True
+            return cur.rowcount == 1
+
+    def used(self, source: str) -> int:
+        day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return 0
+            row = conn.execute(
+                "SELECT used FROM daily_usage WHERE source = ? AND day = ?", (source, day)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
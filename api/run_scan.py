@@ -2,7 +2,16 @@
 import os
 from zoneinfo import ZoneInfo
 from datetime import datetime
-from .index import scan_jobs_automated
+from .index import close_smtp_connection, scan_jobs_automated
+
+def _parse_hours(hours_csv: str) -> frozenset:
+    return frozenset(int(h.strip()) for h in hours_csv.split(",") if h.strip().isdigit())
+
+# Gate config is read once at import, so a bad GATE_TZ fails at startup rather than at the gate
+_HOURS_CSV = os.getenv("RUN_HOURS_LOCAL", "")
+_TZ_NAME = os.getenv("GATE_TZ", "")
+_GATE_TZ = ZoneInfo(_TZ_NAME) if _HOURS_CSV and _TZ_NAME else None  # None: no gating configured
+_ALLOWED_HOURS = _parse_hours(_HOURS_CSV)
 
 def _should_run_now() -> bool:
     """
@@ -10,18 +19,12 @@ def _should_run_now() -> bool:
     only run when the local hour is in the allowlist (e.g., 8,12,17,23).
     This makes the single hourly Render job DST-safe.
     """
-    hours_csv = os.getenv("RUN_HOURS_LOCAL", "")
-    tz_name = os.getenv("GATE_TZ", "")
-    if not hours_csv or not tz_name:
-        return True  # no gating configured
-
-    allowed = {int(h.strip()) for h in hours_csv.split(",") if h.strip().isdigit()}
-    now_local = datetime.now(ZoneInfo(tz_name))
-    return now_local.hour in allowed
+    return _GATE_TZ is None or datetime.now(_GATE_TZ).hour in _ALLOWED_HOURS
 
 if __name__ == "__main__":
     if _should_run_now():
         print("⏰ Gate passed — running scan_jobs_automated()")
         scan_jobs_automated()
+        close_smtp_connection()
     else:
         print("⏭️  Gate skipped — current local hour not in RUN_HOURS_LOCAL")
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# (hash, title, company, location, first_seen, last_seen, url)
+SeenRow = Tuple[str, str, str, str, str, str, str]
+# (hash, content fingerprint) of a posting the eligibility filter turned down
+RejectedRow = Tuple[str, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_jobs (
+    hash       TEXT PRIMARY KEY,
+    title      TEXT NOT NULL,
+    company    TEXT NOT NULL,
+    location   TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen  TEXT NOT NULL,
+    url        TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rejected_jobs (
+    hash        TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    last_seen   TEXT NOT NULL
+) WITHOUT ROWID;
+-- prune() deletes by date; these keep it to a range scan instead of a full table walk
+CREATE INDEX IF NOT EXISTS seen_jobs_first_seen ON seen_jobs (first_seen);
+CREATE INDEX IF NOT EXISTS rejected_jobs_last_seen ON rejected_jobs (last_seen);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Stay under SQLITE_MAX_VARIABLE_NUMBER on older builds (999)
+_MAX_PARAMS = 900
+
+
+class SeenJobStore:
+    """Postings the scanner has already handled, keyed by job hash, in a SQLite file.
+
+    Lookups and writes only touch the rows in the current batch, so a scan costs
+    O(batch) instead of re-reading and re-writing the whole history.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen_jobs").fetchone()[0]
+
+    def known(self, hashes: Iterable[str]) -> Set[str]:
+        """Return the subset of `hashes` already in the store."""
+        pending = list(dict.fromkeys(hashes))
+        found: Set[str] = set()
+        with self._lock:
+            for i in range(0, len(pending), _MAX_PARAMS):
+                chunk = pending[i:i + _MAX_PARAMS]
+                marks = ",".join("?" * len(chunk))
+                found.update(
+                    r[0] for r in self._conn.execute(f"SELECT hash FROM seen_jobs WHERE hash IN ({marks})", chunk)
+                )
+        return found
+
+    def rejected_fingerprints(self, hashes: Iterable[str]) -> Dict[str, str]:
+        """Map each of `hashes` that was rejected before to the fingerprint it was rejected with."""
+        pending = list(dict.fromkeys(hashes))
+        found: Dict[str, str] = {}
+        with self._lock:
+            for i in range(0, len(pending), _MAX_PARAMS):
+                chunk = pending[i:i + _MAX_PARAMS]
+                marks = ",".join("?" * len(chunk))
+                found.update(
+                    self._conn.execute(
+                        f"SELECT hash, fingerprint FROM rejected_jobs WHERE hash IN ({marks})", chunk
+                    )
+                )
+        return found
+
+    def record_scan(
+        self,
+        day: str,
+        touched: Sequence[str],
+        added: Sequence[SeenRow],
+        last_updated: str,
+        rejected: Sequence[RejectedRow] = (),
+    ) -> None:
+        """Bump last_seen on re-seen postings, insert new ones and remember rejections, in one transaction."""
+        with self._lock, self._conn:
+            if touched:
+                self._conn.executemany(
+                    "UPDATE seen_jobs SET last_seen = ? WHERE hash = ?", ((day, h) for h in touched)
+                )
+            if added:
+                self._conn.executemany("INSERT OR IGNORE INTO seen_jobs VALUES (?, ?, ?, ?, ?, ?, ?)", added)
+            if rejected:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO rejected_jobs VALUES (?, ?, ?)", ((h, fp, day) for h, fp in rejected)
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_updated', ?)", (last_updated,)
+            )
+
+    def prune(self, cutoff_day: str) -> int:
+        """Delete postings first seen before `cutoff_day` (YYYY-MM-DD); returns rows removed.
+
+        Remembered rejections not seen since `cutoff_day` are dropped as well.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM rejected_jobs WHERE last_seen < ?", (cutoff_day,))
+            return self._conn.execute("DELETE FROM seen_jobs WHERE first_seen < ?", (cutoff_day,)).rowcount
+
+    def rows(self) -> List[SeenRow]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT hash, title, company, location, first_seen, last_seen, url FROM seen_jobs"
+            ).fetchall()
+
+    def replace_all(self, rows: Iterable[SeenRow]) -> None:
+        """Swap the whole table for `rows` atomically (used when job keys are re-derived)."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM seen_jobs")
+            self._conn.execute("DELETE FROM rejected_jobs")  # keyed by the old hashes too
+            self._conn.executemany("INSERT OR REPLACE INTO seen_jobs VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
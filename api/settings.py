@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional
 import json
 import os
 
 
-@dataclass
+# Read-only once loaded: shared by every request thread, so nothing may mutate it
+@dataclass(frozen=True, slots=True)
 class Settings:
     # Secrets
     jsearch_api_key: str = ""
@@ -18,25 +21,30 @@ class Settings:
     default_country: str = "Canada"
     max_results: int = 100
     min_results_primary: int = 40
+    provider_timeout_seconds: float = 30.0
     cache_ttl_seconds: int = 3600
-    rate_limits: Dict[str, Dict[str, int]] = None  # per-source limits
+    cache_max_items: int = 4096
+    rate_limits: Mapping[str, Mapping[str, int]] = field(default_factory=dict)  # per-source limits
 
     # Defaults for source behavior
     adzuna_country_code: str = "ca"
 
     @staticmethod
-    def _parse_rate_limits(raw: Optional[str]) -> Dict[str, Dict[str, int]]:
+    def _parse_rate_limits(raw: Optional[str]) -> Mapping[str, Mapping[str, int]]:
         if not raw:
-            return {}
+            return MappingProxyType({})
         try:
             data = json.loads(raw)
             if isinstance(data, dict):
-                return data
+                return MappingProxyType(
+                    {k: MappingProxyType(v) if isinstance(v, dict) else v for k, v in data.items()}
+                )
         except Exception:
             pass
-        return {}
+        return MappingProxyType({})
 
     @classmethod
+    @lru_cache(maxsize=1)
     def load(cls) -> "Settings":
         return cls(
             jsearch_api_key=os.getenv("JSEARCH_API_KEY", ""),
@@ -46,7 +54,9 @@ class Settings:
             default_country=os.getenv("DEFAULT_COUNTRY", "Canada"),
             max_results=int(os.getenv("MAX_RESULTS", "100")),
             min_results_primary=int(os.getenv("MIN_RESULTS_PRIMARY", "40")),
+            provider_timeout_seconds=float(os.getenv("PROVIDER_TIMEOUT_SECONDS", "30")),
             cache_ttl_seconds=int(os.getenv("CACHE_TTL_SECONDS", "3600")),
+            cache_max_items=int(os.getenv("CACHE_MAX_ITEMS", "4096")),
             rate_limits=cls._parse_rate_limits(os.getenv("RATE_LIMITS_JSON")),
             adzuna_country_code=os.getenv("ADZUNA_COUNTRY_CODE", "ca").lower(),
         )
@@ -0,0 +1,272 @@
+import threading
+from datetime import timedelta
+
+import pytest
+import requests
+
+from api.adapters import utils
+from api.adapters.utils import (
+    INVALID,
+    QUOTA,
+    REJECTED,
+    UNAVAILABLE,
+    CircuitBreaker,
+    RateLimiter,
+    SimpleCache,
+    SingleFlight,
+    guarded_fetch,
+    request_with_retry,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(utils.time, "monotonic", fake)
+    monkeypatch.setattr(utils.time, "sleep", lambda _: None)
+    return fake
+
+
+class StubResponse:
+    def __init__(self, status_code, content=b"{}"):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+        self.elapsed = timedelta(seconds=0.1)
+
+
+class StubSession:
+    """Returns the queued responses in order; an exception instance is raised instead."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        resp = self.responses.pop(0)
+        if isinstance(resp, Exception):
+            raise resp
+        return resp
+
+
+# ------------------------ CircuitBreaker ------------------------
+
+def test_breaker_trips_after_threshold_failures(clock):
+    breaker = CircuitBreaker("test", threshold=3, cooldown_seconds=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+
+def test_breaker_allows_one_trial_after_cooldown(clock):
+    breaker = CircuitBreaker("test", threshold=1, cooldown_seconds=60)
+    breaker.record_failure()
+    clock.now += 59
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_breaker_lapsed_trial_allows_another(clock):
+    breaker = CircuitBreaker("test", threshold=1, cooldown_seconds=60)
+    breaker.record_failure()
+    clock.now += 60
+    assert breaker.allow()
+    # The trial never reports back
+    clock.now += 59
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+
+def test_breaker_trial_outcome(clock):
+    breaker = CircuitBreaker("test", threshold=1, cooldown_seconds=60)
+    breaker.record_failure()
+    clock.now += 60
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+    clock.now += 60
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow()
+    assert breaker.allow()
+
+
+# ------------------------ request_with_retry ------------------------
+
+def test_request_success_decodes_json(clock):
+    session = StubSession(StubResponse(200, b'{"jobs": []}'))
+    assert request_with_retry(session, "GET", "https://example.test") == ({"jobs": []}, None)
+
+
+@pytest.mark.parametrize(
+    "responses, reason",
+    [
+        ((StubResponse(400),), REJECTED),
+        ((StubResponse(200, b"<html>"),), INVALID),
+        ((StubResponse(503),) * 4, UNAVAILABLE),
+        ((requests.ConnectionError(),) * 4, UNAVAILABLE),
+    ],
+)
+def test_request_failure_reasons(clock, responses, reason):
+    session = StubSession(*responses)
+    assert request_with_retry(session, "GET", "https://example.test") == (None, reason)
+    assert session.calls == len(responses)
+
+
+def test_request_refused_first_attempt_reports_quota(clock):
+    session = StubSession()
+    assert request_with_retry(session, "GET", "https://example.test", acquire=lambda: False) == (None, QUOTA)
+    assert session.calls == 0
+
+
+def test_request_refused_retry_reports_unavailable(clock):
+    grants = iter([True, False])
+    session = StubSession(StubResponse(503))
+    result = request_with_retry(session, "GET", "https://example.test", acquire=lambda: next(grants))
+    assert result == (None, UNAVAILABLE)
+    assert session.calls == 1
+
+
+# ------------------------ guarded_fetch ------------------------
+
+def _fetch(breaker, cache, send):
+    return guarded_fetch(cache, SingleFlight(), RateLimiter(), breaker, "key", send, lambda data: data["items"])
+
+
+@pytest.mark.parametrize("reason", [REJECTED, INVALID, QUOTA])
+def test_answered_or_unsent_failures_do_not_trip_breaker(clock, reason):
+    breaker = CircuitBreaker("test", threshold=1, cooldown_seconds=60)
+    cache = SimpleCache()
+    assert _fetch(breaker, cache, lambda acquire: (None, reason)) == []
+    assert breaker.allow()
+    assert cache.get("key") is None
+
+
+def test_unavailable_trips_breaker_and_negative_caches(clock):
+    breaker = CircuitBreaker("test", threshold=1, cooldown_seconds=60)
+    cache = SimpleCache()
+    assert _fetch(breaker, cache, lambda acquire: (None, UNAVAILABLE)) == []
+    assert not breaker.allow()
+    assert cache.get("key") == []
+
+
+def test_success_is_parsed_and_cached(clock):
+    cache = SimpleCache()
+    breaker = CircuitBreaker("test")
+    assert _fetch(breaker, cache, lambda acquire: ({"items": [1, 2]}, None)) == [1, 2]
+    assert _fetch(breaker, cache, lambda acquire: pytest.fail("served from cache")) == [1, 2]
+
+
+def test_every_attempt_is_charged_to_limiter_and_budget(clock):
+    limiter = RateLimiter(max_per_minute=3, max_per_day=100)
+    budget = []
+
+    def charge():
+        budget.append(1)
+        return True
+
+    session = StubSession(StubResponse(503), StubResponse(503), StubResponse(503))
+
+    def send(acquire):
+        return request_with_retry(session, "GET", "https://example.test", acquire=acquire)
+
+    result = guarded_fetch(
+        SimpleCache(), SingleFlight(), limiter, CircuitBreaker("test"), "key", send, lambda data: data, charge=charge,
+    )
+    # Three attempts fill the per-minute quota; the fourth is refused before it is sent
+    assert result == []
+    assert session.calls == 3
+    assert len(budget) == 3
+    assert not limiter.acquire()
+
+
+def test_fetches_past_the_limiter_quota_are_not_sent(clock):
+    limiter = RateLimiter(max_per_minute=2, max_per_day=100)
+    sent = []
+
+    def send(acquire):
+        if not acquire():
+            return None, QUOTA
+        sent.append(1)
+        return {"items": [1]}, None
+
+    results = [
+        guarded_fetch(SimpleCache(), SingleFlight(), limiter, CircuitBreaker("test"), key, send, lambda d: d["items"])
+        for key in ("a", "b", "c")
+    ]
+    assert results == [[1], [1], []]
+    assert len(sent) == 2
+
+
+# ------------------------ SingleFlight ------------------------
+
+def _lead_and_follow(leader_fn, follower_fn):
+    """Run leader_fn through SingleFlight, then a follower for the same key while it is in flight."""
+    flight = SingleFlight()
+    started, follower_calling, release = threading.Event(), threading.Event(), threading.Event()
+    outcomes = []
+
+    def run(fn):
+        try:
+            outcomes.append(flight.do("k", fn))
+        except ValueError as exc:
+            outcomes.append(exc)
+
+    def lead():
+        started.set()
+        # Hold the call open until the follower has called do()
+        release.wait(5)
+        return leader_fn()
+
+    def follow():
+        follower_calling.set()
+        run(follower_fn)
+
+    leader = threading.Thread(target=run, args=(lead,))
+    leader.start()
+    assert started.wait(5)
+    follower = threading.Thread(target=follow)
+    follower.start()
+    assert follower_calling.wait(5)
+    # follower_fn returns at once, so a follower still running is waiting on the leader
+    follower.join(0.2)
+    assert follower.is_alive()
+    release.set()
+    leader.join(5)
+    follower.join(5)
+    return outcomes
+
+
+def test_single_flight_follower_shares_leader_result():
+    calls = []
+    outcomes = _lead_and_follow(lambda: calls.append(1) or "result", lambda: "follower ran")
+    assert outcomes == ["result", "result"]
+    assert calls == [1]
+
+
+def test_single_flight_follower_gets_leader_exception():
+    def boom():
+        raise ValueError("boom")
+
+    outcomes = _lead_and_follow(boom, lambda: "follower ran")
+    assert [str(o) for o in outcomes] == ["boom", "boom"]
+
+
+def test_single_flight_forgets_finished_calls():
+    flight = SingleFlight()
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 2
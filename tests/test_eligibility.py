@@ -0,0 +1,91 @@
+import pytest
+
+from api import index
+from api.index import is_eligible_job
+
+
+@pytest.mark.parametrize(
+    "description, eligible",
+    [
+        ("Junior Data Analyst. Requires 3 years working in data analytics. SQL is a plus.", False),
+        ("Junior data analyst. 5 years in a similar role.", False),
+        ("Junior data analyst, 3 yrs exp.", False),
+        ("Junior data analyst. Requires 3 yrs. of SQL.", False),
+        ("Junior data analyst. 12+ years experience.", False),
+        ("Junior data analyst. Minimum 2 years.", False),
+        ("Junior data analyst. 3-5 years.", False),
+        ("Junior data analyst. 3 ans d'expérience.", False),
+        ("Junior data analyst. 0-2 years.", True),
+        ("Junior data analyst. 1.5 years.", True),
+        ("Junior data analyst. Serving clients for over 50 years.", True),
+    ],
+)
+def test_year_requirements(description, eligible):
+    ok, reason = is_eligible_job({"title": "", "description": description})
+    assert ok is eligible, reason
+
+
+@pytest.mark.parametrize(
+    "description, eligible",
+    [
+        # The French pattern used to read "...ans\b.*expérien|experience", which
+        # rejected any posting containing the word "experience"
+        ("Junior data analyst. No experience required.", True),
+        ("Junior data analyst. Experience with SQL is an asset.", True),
+        ("Analyste de données junior. 3 ans d'expérience.", False),
+        ("Analyste de données junior. 2 ans d'experience requis.", False),
+        ("Analyste de données junior. 3 ans minimum d’expérience.", False),
+        ("Junior data analyst. Nouveau diplome, 2 ans de contrat. Aucune expérience requise.", True),
+    ],
+)
+def test_french_years_only_rejects_french_requirements(description, eligible):
+    ok, reason = is_eligible_job({"title": "", "description": description})
+    assert ok is eligible, reason
+
+
+def test_requirements_past_the_description_limit_are_not_checked(monkeypatch):
+    # Deliberate trade-off: only the leading ELIGIBILITY_DESC_CHARS are scanned, so a
+    # requirement buried deep in a long description is missed. 0 scans everything.
+    monkeypatch.setattr(index, "ELIGIBILITY_DESC_CHARS", 2048)
+    job = {"title": "Junior Data Analyst", "description": "x " * 1100 + "Security clearance required."}
+    assert is_eligible_job(job)[0] is True
+    monkeypatch.setattr(index, "ELIGIBILITY_DESC_CHARS", 0)
+    assert is_eligible_job(job) == (False, "Requires security clearance")
+
+
+@pytest.mark.parametrize(
+    "title, description, reason",
+    [
+        ("Analyst", "Work on machine learning pipelines. Entry level.", "ai/ml/data-related - entry level"),
+        ("Data Analyst", "0 to 1.5 yrs with SQL.", "data analyst (acceptable experience: 0-1.5 years)"),
+        (
+            "Data Analyst", "Must have experience with SQL. Python is nice to have.",
+            "data analyst (flexible experience - entry level welcome)",
+        ),
+        (
+            "Data Analyst", "Must have experience with SQL.",
+            "Experience requirements unclear - likely requires >1.5 years",
+        ),
+        ("Data Analyst", "Mentorship and SQL.", "data analyst (training provided - good for new grads)"),
+        ("Data Analyst", "SQL and dashboards.", "Ambiguous experience requirements (not clearly entry-level)"),
+    ],
+)
+def test_keyword_list_steps(title, description, reason):
+    assert is_eligible_job({"title": title, "description": description})[1] == reason
+
+
+@pytest.mark.parametrize(
+    "title, description, eligible",
+    [
+        # Keywords are casefolded at import and the job text once per call
+        ("SENIOR DATA ANALYST", "SQL.", False),
+        ("JUNIOR DATA ANALYST", "ENTRY LEVEL ROLE.", True),
+        ("Data Analyst", "PERMANENT RESIDENT status required. Entry level.", False),
+        # The level check reads the raw title case-insensitively
+        ("Data Analyst II", "Entry level.", False),
+        ("data analyst iii", "Entry level.", False),
+    ],
+)
+def test_matching_ignores_case(title, description, eligible):
+    ok, reason = is_eligible_job({"title": title, "description": description})
+    assert ok is eligible, reason
@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from api import index
+from api.seen_store import SeenJobStore
+
+NOW = datetime(2026, 10, 15, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    seen = SeenJobStore(str(tmp_path / "seen.db"))
+    monkeypatch.setattr(index, "get_seen_store", lambda: seen)
+    yield seen
+    seen.close()
+
+
+def _job(city, title="Junior Data Analyst", company="Acme"):
+    return {
+        "title": title,
+        "company": company,
+        "location": city,
+        "description": "Entry level role, SQL and Python.",
+        "url": f"https://example.test/{city}",
+        "posted_at": NOW.isoformat(),
+    }
+
+
+def test_variants_within_a_batch_are_emailed_once(store):
+    new_jobs, total = index._process_raw_jobs([_job("Toronto"), _job("Ottawa")], NOW)
+    assert [j["location"] for j in new_jobs] == ["Toronto"]
+    # Both variants are stored, so neither is emailed again later
+    assert total == 2
+    assert index._process_raw_jobs([_job("Ottawa")], NOW)[0] == []
+
+
+def test_variant_of_a_posting_from_an_earlier_scan_is_emailed(store):
+    assert len(index._process_raw_jobs([_job("Toronto")], NOW)[0]) == 1
+    new_jobs, total = index._process_raw_jobs([_job("Toronto"), _job("Ottawa")], NOW)
+    assert [j["location"] for j in new_jobs] == ["Ottawa"]
+    assert total == 2
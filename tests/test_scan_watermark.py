@@ -0,0 +1,41 @@
+import pytest
+from fastapi import Response
+
+from api import index
+
+
+class FakeStore:
+    def __init__(self):
+        self.meta = {}
+
+    def get_meta(self, key):
+        return self.meta.get(key)
+
+    def set_meta(self, key, value):
+        self.meta[key] = value
+
+
+@pytest.fixture
+def store(monkeypatch):
+    fake = FakeStore()
+    monkeypatch.setattr(index, "get_seen_store", lambda: fake)
+    return fake
+
+
+def _no_jobs(incomplete):
+    return lambda max_days_old: ([], incomplete)
+
+
+@pytest.mark.parametrize("incomplete, advanced", [(0, True), (1, False)])
+def test_empty_scan_endpoint_advances_watermark_only_when_complete(monkeypatch, store, incomplete, advanced):
+    monkeypatch.setattr(index, "search_all_jobs", _no_jobs(incomplete))
+    result = index.scan(Response())
+    assert result["count"] == 0
+    assert (index.SCAN_WATERMARK_KEY in store.meta) is advanced
+
+
+@pytest.mark.parametrize("incomplete, advanced", [(0, True), (1, False)])
+def test_empty_automated_scan_advances_watermark_only_when_complete(monkeypatch, store, incomplete, advanced):
+    monkeypatch.setattr(index, "search_all_jobs", _no_jobs(incomplete))
+    index.scan_jobs_automated()
+    assert (index.SCAN_WATERMARK_KEY in store.meta) is advanced